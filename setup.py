@@ -0,0 +1,29 @@
+"""
+Build script for the optional Cython extension (src/cache_ext.pyx)
+
+    python setup.py build_ext --inplace
+
+puts cache_ext next to the other modules in src/, where main.py picks it up.
+That is all this script is for: the simulator itself is run from src/ and
+is not installed as a package (so `pip install .` gives you nothing useful).
+"""
+
+import sys
+from setuptools import setup, Extension
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    sys.exit("❌ Building cache_ext needs Cython: pip install Cython\n"
+             "   (it is optional - src/main.py runs fine without it)")
+
+extensions = [
+    Extension("cache_ext", ["src/cache_ext.pyx"]),
+]
+
+setup(
+    name="cache-simulator",
+    package_dir={"": "src"},
+    py_modules=[],
+    ext_modules=cythonize(extensions, language_level=3),
+)
@@ -0,0 +1,23 @@
+"""
+📦 AOT Build - Compile the cache kernels once, ship them as a module
+⏱️ The JIT costs a second or two on the first run; a prebuilt module costs nothing
+🔧 Run:  python src/build_aot.py  ->  src/cache_aot.*.so (cache.py picks it up)
+"""
+
+import os
+from numba.pycc import CC
+from cache_kernel import simulate_lru, simulate_fifo, simulate_direct
+
+# (set_indices, trace_tags, tags, meta, hit_flags, clock) -> (hits, replacements, clock)
+SIGNATURE = 'UniTuple(i8, 3)(i8[:], i8[:], i8[:, :], i8[:, :], b1[:], i8)'
+
+cc = CC('cache_aot')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('simulate_lru', SIGNATURE)(simulate_lru.py_func)
+cc.export('simulate_fifo', SIGNATURE)(simulate_fifo.py_func)
+cc.export('simulate_direct', SIGNATURE)(simulate_direct.py_func)
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"✅ Built cache_aot in {cc.output_dir}")
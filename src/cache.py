@@ -4,106 +4,385 @@
 💻 Because cache misses are why your program is slow
 """
 
-from replacement_policies import LRUPolicy, FIFOPolicy, RandomPolicy
+import os
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from replacement_policies import (LRUPolicy, FIFOPolicy, RandomPolicy,
+                                  DirectMappedPolicy)
+try:
+    # Prebuilt kernels (python src/build_aot.py) - no JIT warm-up at all
+    from cache_aot import simulate_lru, simulate_fifo, simulate_direct
+    KERNEL_AVAILABLE = True
+    KERNEL_RELEASES_GIL = False  # pycc exports keep holding the GIL
+except ImportError:
+    from cache_kernel import simulate_lru, simulate_fifo, simulate_direct
+    from cache_kernel import NUMBA_AVAILABLE as KERNEL_AVAILABLE
+    KERNEL_RELEASES_GIL = KERNEL_AVAILABLE  # @njit(nogil=True)
+
+# Policy name -> class, looked up once per cache
+POLICIES = {
+    "LRU": LRUPolicy,
+    "FIFO": FIFOPolicy,
+    "RANDOM": RandomPolicy,
+}
+
+# One access_log record: address, result (1 = HIT, 0 = MISS), set index
+LOG_DTYPE = np.dtype([('address', 'u8'), ('result', 'u1'), ('set', 'u4')])
 
 class Cache:
     """
     Your personal cache lab - break it, fix it, learn from it!
     """
     
-    def __init__(self, config, policy_name="LRU"):
+    # Fixed attribute set: no per-instance __dict__, faster attribute access.
+    # 'access' is a slot because __init__ binds one of the _access_* methods.
+    __slots__ = (
+        'config', 'policy', 'tags', 'meta', 'access', 'verbose',
+        '_accesses', '_hits', '_misses', '_replacements', '_clock',
+        '_rows', '_rows_live', '_replay_policy', '_policy_access',
+        '_kernel', '_debug_mode',
+        '_log_cap', '_log_idx', '_log_addr', '_log_set', '_log_res',
+    )
+    
+    def __init__(self, config, policy_name="LRU", verbose=False, seed=42):
         self.config = config
-        self.stats = {
-            'accesses': 0,
-            'hits': 0,
-            'misses': 0,
-            'replacements': 0
-        }
+        self.verbose = verbose  # chatty construction messages
+        # Counters live in plain attributes; get_stats() builds the dict
+        self._accesses = 0
+        self._hits = 0
+        self._misses = 0
+        self._replacements = 0
         
-        # Build the actual cache structure
-        self.sets = [[] for _ in range(config.num_sets)]
-        self._setup_policy(policy_name)
+        # Build the actual cache structure, in the shape each path wants:
+        # - _rows: one array('q') of tags per set (8 bytes a block), oldest
+        #   first - what access() and the Python replay hand the policies
+        # - tags/meta: one row per set, one column per way, for the kernels
+        #   tags: stored tag (-1 = empty), meta: policy timestamp (0 = empty)
+        # Only one side is current at a time (_rows_live says which):
+        # access() picks the rows back up after a kernel run, access_many()
+        # writes them out before one.
+        self._rows = [array('q') for _ in range(config.num_sets)]
+        self._rows_live = True
+        shape = (config.num_sets, config.ways)
+        self.tags = np.full(shape, -1, dtype=np.int64)
+        self.meta = np.zeros(shape, dtype=np.int64)
+        self._clock = 1
+        self._setup_policy(policy_name, seed)
+        
+        # Access log for analysis: first 1000 accesses, stored column-wise
+        self._log_cap = 1000
+        self._log_idx = 0
+        self._log_addr = np.empty(self._log_cap, dtype=np.uint64)
+        self._log_set = np.empty(self._log_cap, dtype=np.uint32)
+        self._log_res = np.empty(self._log_cap, dtype=np.uint8)  # 1 = HIT
         
         # Debug tools for when you're confused
-        self.debug_mode = False
-        self.access_log = []
+        # (self.access is picked from the _access_* variants below)
+        self._debug_mode = False
+        self._select_access()
         
-        print(f"✅ Cache ready: {policy_name} policy, {config.num_sets} sets")
+        if verbose:
+            print(f"✅ Cache ready: {policy_name} policy, {config.num_sets} sets")
     
-    def _setup_policy(self, policy_name):
-        """Choose your cache strategy"""
-        policy_name = policy_name.upper()
+    def _setup_policy(self, policy_name, seed=42):
+        """Choose your cache strategy (seed only matters for RANDOM)"""
+        policy_class = POLICIES.get(policy_name.upper())
+        if policy_class is None:
+            print(f"❓ Unknown policy, using LRU")
+            policy_class = LRUPolicy
         
-        if policy_name == "LRU":
-            self.policy = LRUPolicy()
-        elif policy_name == "FIFO":
-            self.policy = FIFOPolicy()
-        elif policy_name == "RANDOM":
-            self.policy = RandomPolicy()
+        if policy_class is RandomPolicy:
+            self.policy = RandomPolicy(seed)
         else:
-            print(f"❓ Unknown policy, using LRU")
-            self.policy = LRUPolicy()
+            self.policy = policy_class()
+        
+        # With one way per set every policy does the same thing, so replay
+        # with the specialized version - self.policy keeps the requested
+        # name, and both share one stats dict
+        self._replay_policy = self.policy
+        if self.config.ways == 1:
+            self._replay_policy = DirectMappedPolicy()
+            self._replay_policy.stats = self.policy.stats
+        
+        # Bound once here instead of looking it up on every access
+        self._policy_access = self._replay_policy.access
+        self._kernel = self._pick_kernel()
+    
+    def _pick_kernel(self):
+        """Compiled replay loop for this policy, or None if there isn't one"""
+        if not KERNEL_AVAILABLE:
+            return None
+        if isinstance(self._replay_policy, DirectMappedPolicy):
+            return simulate_direct
+        if isinstance(self._replay_policy, LRUPolicy):
+            return simulate_lru
+        if isinstance(self._replay_policy, FIFOPolicy):
+            return simulate_fifo
+        return None
+    
+    def _replay_releases_gil(self):
+        """Does run_trace() let other threads run while it replays?"""
+        return self._kernel is not None and KERNEL_RELEASES_GIL
+    
+    def _select_access(self):
+        """
+        Point self.access at the cheapest variant that does the job:
+        debug printing, logging (until the log is full), or neither
+        """
+        if self._debug_mode:
+            self.access = self._access_debug
+        elif self._log_idx < self._log_cap:
+            self.access = self._access_logged
+        else:
+            self.access = self._access_fast
     
-    def access(self, address):
+    def _access_fast(self, address):
         """
-        Process a memory access
+        Process a memory access (no debug output, no logging)
         Returns: "HIT" or "MISS"
         """
-        self.stats['accesses'] += 1
+        self._accesses += 1
+        if not self._rows_live:
+            self._load_rows()  # first access() since a kernel run
         
-        # Figure out where this address goes
-        set_index = self._get_set_index(address)
-        tag = self._get_tag(address)
-        
-        if self.debug_mode:
-            print(f"🔍 Access: 0x{address:08X} -> set {set_index}, tag {tag}")
+        # Figure out where this address goes (one call for both halves)
+        set_index, tag = self._locate(address)
         
         # Let the policy handle the actual work
-        result, replaced = self.policy.access(
-            self.sets[set_index], 
+        result, replaced = self._policy_access(
+            self._rows[set_index], 
             tag, 
-            self.config.associativity
+            self.config.ways
         )
         
         # Track what happened
         if result == "HIT":
-            self.stats['hits'] += 1
+            self._hits += 1
         else:
-            self.stats['misses'] += 1
+            self._misses += 1
             if replaced is not None:
-                self.stats['replacements'] += 1
+                self._replacements += 1
+        
+        return result
+    
+    def _access_logged(self, address):
+        """Process a memory access and keep it in the access log"""
+        result = self._access_fast(address)
         
-        # Keep a log for analysis
-        if len(self.access_log) < 1000:
-            self.access_log.append({
-                'address': address,
-                'set': set_index,
-                'result': result
-            })
+        i = self._log_idx
+        if i == self._log_cap:
+            return result  # called through an access bound before the log filled
+        self._log_addr[i] = address
+        self._log_set[i] = self._get_set_index(address)
+        self._log_res[i] = 1 if result == "HIT" else 0
+        self._log_idx += 1
+        
+        # Log is full - drop down to the fast path from now on
+        if self._log_idx == self._log_cap:
+            self._select_access()
         
         return result
     
+    def _load_rows(self):
+        """Rebuild the per-set rows from tags/meta, oldest way first"""
+        order = np.argsort(self.meta, axis=1, kind='stable')
+        by_age = np.take_along_axis(self.tags, order, axis=1).tolist()
+        # Empty ways (meta 0) sort to the front; skip past them
+        self._rows = [array('q', row[row.count(-1):]) for row in by_age]
+        self._rows_live = True
+    
+    def _store_rows(self):
+        """Write the per-set rows into tags/meta for the kernels"""
+        ways = self.config.ways
+        rows = self._rows
+        self.tags[...] = [row.tolist() + [-1] * (ways - len(row)) for row in rows]
+        # Timestamps 1..n in row order (only their order within a set
+        # matters); the kernel clock has to start past all of them
+        filled = np.arange(ways) < np.array([len(row) for row in rows])[:, None]
+        self.meta[...] = np.where(filled, np.arange(1, ways + 1), 0)
+        self._clock = max(self._clock, ways + 1)
+        self._rows_live = False
+    
+    def _access_debug(self, address):
+        """Process a memory access and explain it"""
+        set_index = self._get_set_index(address)
+        tag = self._get_tag(address)
+        print(f"🔍 Access: 0x{address:08X} -> set {set_index}, tag {tag}")
+        
+        if self._log_idx < self._log_cap:
+            return self._access_logged(address)
+        return self._access_fast(address)
+    
+    def run_trace(self, trace):
+        """
+        Run a whole trace (list or NumPy array) through the cache in one go
+        The loop runs inside the compiled kernel whenever the policy has one.
+        Returns: get_stats()
+        """
+        self.access_many(trace)
+        return self.get_stats()
+    
+    def access_many(self, trace):
+        """
+        Process a batch of memory accesses
+        Addresses are decoded with NumPy in one go, then replayed by the
+        compiled kernel (LRU/FIFO/direct-mapped) or a tight Python loop.
+        Debug mode goes through access() so every step still gets printed.
+        Returns: bool array, True where the access was a HIT
+        """
+        if self._debug_mode:
+            if isinstance(trace, np.ndarray):
+                trace = trace.tolist()  # plain ints are much faster here
+            self._replay_policy.prime(len(trace), self.config.ways)
+            return np.array([self.access(address) == "HIT" for address in trace],
+                            dtype=bool)
+        
+        # One conversion up front; everything below works on this array
+        trace = np.ascontiguousarray(trace, dtype=np.uint64)
+        set_indices, trace_tags = self.decode_trace(trace)
+        total = len(trace_tags)
+        
+        if self._kernel is not None:
+            if self._rows_live:
+                self._store_rows()
+            hit_flags = np.zeros(total, dtype=bool)
+            hits, replacements, self._clock = self._kernel(set_indices, trace_tags,
+                                                           self.tags, self.meta,
+                                                           hit_flags, self._clock)
+            hits = int(hits)
+            self.policy.stats['accesses'] += total
+            self.policy.stats['hits'] += hits
+        else:
+            if not self._rows_live:
+                self._load_rows()
+            self._replay_policy.prime(total, self.config.ways)
+            hit_flags, hits, replacements = self._replay(set_indices, trace_tags)
+        
+        self._accesses += total
+        self._hits += hits
+        self._misses += total - hits
+        self._replacements += int(replacements)
+        
+        # Fill whatever is left of the access log straight from the arrays
+        room = min(self._log_cap - self._log_idx, total)
+        if room > 0:
+            i = self._log_idx
+            self._log_addr[i:i + room] = trace[:room]
+            self._log_set[i:i + room] = set_indices[:room]
+            self._log_res[i:i + room] = hit_flags[:room]
+            self._log_idx += room
+            self._select_access()
+        
+        return hit_flags
+    
+    def _replay(self, set_indices, trace_tags):
+        """
+        Pure-Python replay loop for policies without a kernel
+        Everything the loop touches is a local; results go back to self once.
+        Returns: (hit_flags, hits, replacements)
+        """
+        policy_access = self._policy_access
+        rows = self._rows
+        ways = self.config.ways
+        hits = 0
+        replacements = 0
+        flags = [False] * len(set_indices)  # sized once, no append resizes
+        
+        for i, (set_index, tag) in enumerate(zip(set_indices.tolist(),
+                                                 trace_tags.tolist())):
+            result, replaced = policy_access(rows[set_index], tag, ways)
+            if result == "HIT":
+                hits += 1
+                flags[i] = True
+            elif replaced is not None:
+                replacements += 1
+        
+        return np.array(flags, dtype=bool), hits, replacements
+    
+    def decode_trace(self, trace):
+        """
+        Split a whole trace into set indices and tags at once (vectorized)
+        Returns: (set_indices, tags) as int64 arrays
+        """
+        config = self.config
+        trace = np.asarray(trace, dtype=np.uint64)
+        if config.power_of_two:
+            blocks = trace >> np.uint64(config.block_bits)
+            set_indices = blocks & np.uint64(config.set_mask)
+            tags = blocks >> np.uint64(config.set_bits)
+        else:
+            blocks = trace // np.uint64(config.block_size_bytes)
+            set_indices = blocks % np.uint64(config.num_sets)
+            tags = blocks // np.uint64(config.num_sets)
+        return set_indices.astype(np.int64), tags.astype(np.int64)
+    
+    @property
+    def stats(self):
+        """Raw counters as a dict (same keys as before)"""
+        return {
+            'accesses': self._accesses,
+            'hits': self._hits,
+            'misses': self._misses,
+            'replacements': self._replacements
+        }
+    
+    @property
+    def debug_mode(self):
+        return self._debug_mode
+    
+    @debug_mode.setter
+    def debug_mode(self, enabled):
+        self._debug_mode = enabled
+        self._select_access()
+    
+    @property
+    def access_log(self):
+        """The logged accesses as a structured array (LOG_DTYPE)"""
+        n = self._log_idx
+        log = np.empty(n, dtype=LOG_DTYPE)
+        log['address'] = self._log_addr[:n]
+        log['result'] = self._log_res[:n]
+        log['set'] = self._log_set[:n]
+        return log
+    
+    def _locate(self, address):
+        """(set index, tag) for one address"""
+        config = self.config
+        if config.power_of_two:
+            block = address >> config.block_bits
+            return block & config.set_mask, block >> config.set_bits
+        block = address // config.block_size_bytes
+        return block % config.num_sets, block // config.num_sets
+    
     def _get_set_index(self, address):
         """Which set does this address belong to?"""
-        block_num = address // self.config.block_size_bytes
-        return block_num % self.config.num_sets
+        config = self.config
+        if config.power_of_two:
+            return (address >> config.block_bits) & config.set_mask
+        block_num = address // config.block_size_bytes
+        return block_num % config.num_sets
     
     def _get_tag(self, address):
         """Extract the tag from address"""
-        block_num = address // self.config.block_size_bytes
-        return block_num // self.config.num_sets
+        config = self.config
+        if config.power_of_two:
+            return address >> (config.block_bits + config.set_bits)
+        block_num = address // config.block_size_bytes
+        return block_num // config.num_sets
     
     def get_stats(self):
         """Get performance numbers"""
-        total = self.stats['accesses']
-        hit_rate = (self.stats['hits'] / total * 100) if total > 0 else 0
+        total = self._accesses
+        hit_rate = (self._hits / total * 100) if total > 0 else 0
         
         return {
             'accesses': total,
-            'hits': self.stats['hits'],
-            'misses': self.stats['misses'],
+            'hits': self._hits,
+            'misses': self._misses,
             'hit_rate': hit_rate,
-            'replacements': self.stats['replacements'],
+            'replacements': self._replacements,
             'policy': str(self.policy)
         }
     
@@ -143,4 +422,46 @@ class Cache:
     def debug_off(self):
         """Turn off debug mode"""
         self.debug_mode = False
-        print("🐛 Debug mode OFF")
\ No newline at end of file
+        print("🐛 Debug mode OFF")
+
+def run_sweep(caches, trace, max_workers=None):
+    """
+    Run the same trace through several independent caches
+    Caches whose replay releases the GIL (Numba or Cython kernels) share a
+    thread pool; the rest (prebuilt cache_aot kernels, RANDOM's Python loop)
+    run one after another, since threads would only take turns on the GIL.
+    Every cache keeps its own state, nothing is shared.
+    Each cache's replay is timed on the same two clocks wherever it ran:
+    'time' is wall time (perf_counter), 'cpu_time' the CPU time of the
+    thread that ran it. Kernels are compiled before any clock starts.
+    Returns: list of get_stats() dicts with 'time' and 'cpu_time', in order
+    """
+    trace = np.asarray(trace, dtype=np.uint64)
+    for cache in caches:
+        cache.access_many(trace[:0])  # JIT / load the kernel outside the timings
+    
+    def run_one(cache):
+        start_time = time.perf_counter()
+        start_cpu = time.thread_time()
+        stats = cache.run_trace(trace)
+        stats['cpu_time'] = time.thread_time() - start_cpu
+        stats['time'] = time.perf_counter() - start_time
+        return stats
+    
+    parallel = [i for i, cache in enumerate(caches) if cache._replay_releases_gil()]
+    if max_workers is None:
+        max_workers = min(len(parallel), os.cpu_count() or 1)
+    if max_workers <= 1:
+        parallel = []
+    
+    results = [None] * len(caches)
+    for i, cache in enumerate(caches):
+        if i not in parallel:
+            results[i] = run_one(cache)
+    
+    if parallel:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            threaded = executor.map(run_one, [caches[i] for i in parallel])
+            for i, stats in zip(parallel, threaded):
+                results[i] = stats
+    return results
@@ -3,16 +3,27 @@ Cache Configuration Module
 Learning about cache parameters and their relationships
 """
 
+def _is_power_of_two(n):
+    return n > 0 and (n & (n - 1)) == 0
+
 class CacheConfig:
     """
     Configuration class for cache parameters
     Learning how cache size, block size, and associativity interact
     """
     
-    def __init__(self, cache_size_kb=8, block_size_bytes=64, associativity=2):
+    __slots__ = (
+        'cache_size_kb', 'block_size_bytes', 'associativity',
+        'cache_size_bytes', 'num_blocks', 'num_sets', 'ways',
+        'power_of_two', 'block_bits', 'set_bits', 'set_mask', 'verbose',
+    )
+    
+    def __init__(self, cache_size_kb=8, block_size_bytes=64, associativity=2,
+                 verbose=False):
         self.cache_size_kb = cache_size_kb
         self.block_size_bytes = block_size_bytes
         self.associativity = associativity
+        self.verbose = verbose
         
         # Calculate derived parameters
         self.cache_size_bytes = cache_size_kb * 1024
@@ -21,20 +32,39 @@ class CacheConfig:
         # Handle different associativity cases
         if associativity == 0:  # Fully associative
             self.num_sets = 1
+            self.ways = self.num_blocks  # every block lives in the one set
         else:
             self.num_sets = self.num_blocks // associativity
+            self.ways = associativity
         
-        print(f"🎯 Config: {cache_size_kb}KB, {block_size_bytes}B blocks, {associativity}-way")
-        print(f"   -> {self.num_blocks} total blocks, {self.num_sets} sets")
+        # Power-of-two geometry lets us decode addresses with shifts/masks
+        # instead of // and % (that's how real hardware does it)
+        self.power_of_two = (_is_power_of_two(block_size_bytes)
+                             and _is_power_of_two(self.num_sets))
+        if self.power_of_two:
+            self.block_bits = (block_size_bytes - 1).bit_length()
+            self.set_bits = (self.num_sets - 1).bit_length()
+            self.set_mask = self.num_sets - 1
+        else:
+            self.block_bits = self.set_bits = self.set_mask = None
+        
+        if verbose:
+            print(f"🎯 Config: {cache_size_kb}KB, {block_size_bytes}B blocks, {associativity}-way")
+            print(f"   -> {self.num_blocks} total blocks, {self.num_sets} sets")
     
     def get_address_breakdown(self, address):
         """
         Helper method to understand address mapping
         Useful for debugging and learning
         """
-        block_number = address // self.block_size_bytes
-        set_index = block_number % self.num_sets
-        tag = block_number // self.num_sets
+        if self.power_of_two:
+            block_number = address >> self.block_bits
+            set_index = block_number & self.set_mask
+            tag = block_number >> self.set_bits
+        else:
+            block_number = address // self.block_size_bytes
+            set_index = block_number % self.num_sets
+            tag = block_number // self.num_sets
         
         print(f"🔍 Address {address}: block={block_number}, set={set_index}, tag={tag}")
         return set_index, tag
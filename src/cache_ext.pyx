@@ -0,0 +1,100 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+🚀 Cache Extension - The C Lane
+⚙️ Same replay loop as cache_kernel.py, compiled ahead of time with Cython
+🧊 No JIT warm-up, and the GIL is released while the trace runs
+
+Build it with:  python setup.py build_ext --inplace
+"""
+
+import numpy as np
+
+from cache import Cache as _PyCache
+from replacement_policies import LRUPolicy, FIFOPolicy, DirectMappedPolicy
+
+
+cdef (long long, long long, long long) _simulate(
+        const long long[::1] set_indices, const long long[::1] trace_tags,
+        long long[:, ::1] tags, long long[:, ::1] meta,
+        unsigned char[::1] hit_flags, long long clock,
+        bint touch_on_hit) noexcept nogil:
+    """Shared replay loop - see cache_kernel._simulate for the details"""
+    cdef Py_ssize_t assoc = tags.shape[1]
+    cdef Py_ssize_t i, j, found, victim
+    cdef long long si, tag, t, m, oldest
+    cdef long long hits = 0
+    cdef long long replacements = 0
+
+    for i in range(set_indices.shape[0]):
+        si = set_indices[i]
+        tag = trace_tags[i]
+
+        found = -1
+        victim = 0
+        oldest = meta[si, 0]
+        for j in range(assoc):
+            t = tags[si, j]
+            m = meta[si, j]
+            found = j if t == tag else found
+            victim = j if m < oldest else victim
+            oldest = m if m < oldest else oldest
+
+        if found >= 0:
+            hits += 1
+            hit_flags[i] = 1
+            if touch_on_hit:
+                meta[si, found] = clock
+        else:
+            if tags[si, victim] != -1:
+                replacements += 1
+            tags[si, victim] = tag
+            meta[si, victim] = clock
+        clock += 1
+
+    return hits, replacements, clock
+
+
+def _run(set_indices, trace_tags, tags, meta, hit_flags, long long clock,
+         bint touch_on_hit):
+    cdef const long long[::1] set_view = set_indices
+    cdef const long long[::1] tag_view = trace_tags
+    cdef long long[:, ::1] tags_view = tags
+    cdef long long[:, ::1] meta_view = meta
+    cdef unsigned char[::1] flags_view = hit_flags.view(np.uint8)
+    cdef (long long, long long, long long) result
+
+    with nogil:
+        result = _simulate(set_view, tag_view, tags_view, meta_view,
+                           flags_view, clock, touch_on_hit)
+    return result
+
+
+def simulate_lru(set_indices, trace_tags, tags, meta, hit_flags, clock):
+    """LRU replay: meta holds the time of last use"""
+    return _run(set_indices, trace_tags, tags, meta, hit_flags, clock, True)
+
+
+def simulate_fifo(set_indices, trace_tags, tags, meta, hit_flags, clock):
+    """FIFO replay: meta holds the time the block came in"""
+    return _run(set_indices, trace_tags, tags, meta, hit_flags, clock, False)
+
+
+class Cache(_PyCache):
+    """
+    Drop-in Cache that replays traces with the Cython loops above
+    Works without Numba - everything else is inherited from cache.Cache
+    """
+
+    __slots__ = ()
+
+    def _replay_releases_gil(self):
+        # The loops above run inside 'with nogil'
+        return self._kernel is not None
+
+    def _pick_kernel(self):
+        # With a single way the shared loop is already just one compare
+        if isinstance(self._replay_policy, (LRUPolicy, DirectMappedPolicy)):
+            return simulate_lru
+        if isinstance(self._replay_policy, FIFOPolicy):
+            return simulate_fifo
+        return None
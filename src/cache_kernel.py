@@ -0,0 +1,107 @@
+"""
+⚡ Cache Kernel - The Fast Lane
+🏎️ Numba-compiled trace replay, no Python objects per access
+🧮 Same decisions as replacement_policies.py, on Cache's tag/meta arrays
+🧵 nogil=True, so independent caches can replay in parallel threads
+"""
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    # No Numba? The kernel still runs as (slow) plain Python
+    NUMBA_AVAILABLE = False
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda func: func
+
+
+@njit(cache=True, nogil=True)
+def _simulate(set_indices, trace_tags, tags, meta, hit_flags, clock,
+              touch_on_hit):
+    """
+    Shared replay loop for the timestamp-based policies
+
+    set_indices, trace_tags: int64[n] per-access set index and tag
+    tags:      int64[num_sets, assoc] stored tags, -1 = empty way
+    meta:      int64[num_sets, assoc] timestamps, 0 = empty way
+    hit_flags: bool[n] output, True where the access hit
+    clock:     timestamp for the first access (must be > every meta value)
+    touch_on_hit: refresh the timestamp on a hit (LRU) or not (FIFO)
+    Returns: (hits, replacements, next clock), tags/meta updated in place
+    """
+    assoc = tags.shape[1]
+    hits = 0
+    replacements = 0
+
+    for i in range(set_indices.shape[0]):
+        si = set_indices[i]
+        tag = trace_tags[i]
+
+        # One branchless pass: look for the tag and track the oldest way
+        # (empty ways have timestamp 0, so they always lose first).
+        # Conditional expressions instead of if-blocks let LLVM turn the
+        # loop into cmov/vector compares instead of mispredicted jumps.
+        found = -1
+        victim = 0
+        oldest = meta[si, 0]
+        for j in range(assoc):
+            t = tags[si, j]
+            m = meta[si, j]
+            found = j if t == tag else found
+            older = m < oldest
+            victim = j if older else victim
+            oldest = m if older else oldest
+
+        if found >= 0:
+            hits += 1
+            hit_flags[i] = True
+            if touch_on_hit:
+                meta[si, found] = clock
+        else:
+            if tags[si, victim] != -1:
+                replacements += 1
+            tags[si, victim] = tag
+            meta[si, victim] = clock
+        clock += 1
+
+    return hits, replacements, clock
+
+
+@njit(cache=True, nogil=True)
+def simulate_lru(set_indices, trace_tags, tags, meta, hit_flags, clock):
+    """LRU replay: meta holds the time of last use"""
+    return _simulate(set_indices, trace_tags, tags, meta, hit_flags, clock,
+                     True)
+
+
+@njit(cache=True, nogil=True)
+def simulate_fifo(set_indices, trace_tags, tags, meta, hit_flags, clock):
+    """FIFO replay: meta holds the time the block came in"""
+    return _simulate(set_indices, trace_tags, tags, meta, hit_flags, clock,
+                     False)
+
+
+@njit(cache=True, nogil=True)
+def simulate_direct(set_indices, trace_tags, tags, meta, hit_flags, clock):
+    """Direct-mapped replay: one way per set, no search, no victim choice"""
+    hits = 0
+    replacements = 0
+
+    for i in range(set_indices.shape[0]):
+        si = set_indices[i]
+        tag = trace_tags[i]
+        old = tags[si, 0]
+        if old == tag:
+            hits += 1
+            hit_flags[i] = True
+        else:
+            if old != -1:
+                replacements += 1
+            tags[si, 0] = tag
+            meta[si, 0] = clock
+        clock += 1
+
+    return hits, replacements, clock
@@ -4,9 +4,13 @@
 💡 No more boring textbook explanations
 """
 
-import time
 from cache_config import CacheConfig
-from cache import Cache
+try:
+    # Compiled Cython version, if it has been built (see setup.py)
+    from cache_ext import Cache
+except ImportError:
+    from cache import Cache
+from cache import run_sweep
 from trace_generator import TraceGenerator
 from visualizer import Visualizer
 
@@ -31,99 +35,96 @@ def experiment_basic_functionality():
     cache.print_stats()
     return cache
 
-def experiment_policy_comparison():
+def experiment_policy_comparison(generator=None):
     """Compare different replacement policies"""
     print("\n" + "=" * 60)
     print("🔬 EXPERIMENT 2: Replacement Policy Comparison")
     print("=" * 60)
     
-    generator = TraceGenerator()
+    if generator is None:
+        generator = TraceGenerator()
     trace = generator.mixed(800)
     
     policies = ["LRU", "FIFO", "RANDOM"]
     results = {}
     
+    caches = []
     for policy in policies:
-        print(f"\n--- Testing {policy} policy ---")
+        print(f"\n--- Setting up {policy} policy ---")
         config = CacheConfig(cache_size_kb=8, block_size_bytes=64, associativity=4)
-        cache = Cache(config, policy_name=policy)
-        
-        # Run simulation
-        start_time = time.time()
-        for address in trace:
-            cache.access(address)
-        end_time = time.time()
-        
-        stats = cache.get_stats()
-        stats['time'] = end_time - start_time
+        caches.append(Cache(config, policy_name=policy))
+    
+    # Run all simulations side by side (each stats dict comes back with its time)
+    for policy, stats in zip(policies, run_sweep(caches, trace)):
         results[policy] = stats
         
+        print(f"\n--- {policy} policy ---")
         print(f"  Hit rate: {stats['hit_rate']:.2f}%")
         print(f"  Time: {stats['time']:.3f}s")
     
     return results
 
-def experiment_cache_size_impact():
+def experiment_cache_size_impact(generator=None):
     """Test how cache size affects performance"""
     print("\n" + "=" * 60)
     print("📈 EXPERIMENT 3: Cache Size Impact")
     print("=" * 60)
     
-    generator = TraceGenerator()
+    if generator is None:
+        generator = TraceGenerator()
     trace = generator.mixed(1000)
     
     sizes = [2, 4, 8, 16, 32]  # KB
     results = {}
     
+    caches = []
     for size in sizes:
-        print(f"\n--- Testing {size}KB cache ---")
+        print(f"\n--- Setting up {size}KB cache ---")
         config = CacheConfig(cache_size_kb=size, block_size_bytes=64, associativity=2)
-        cache = Cache(config, policy_name="LRU")
-        
-        for address in trace:
-            cache.access(address)
-        
-        stats = cache.get_stats()
+        caches.append(Cache(config, policy_name="LRU"))
+    
+    for size, stats in zip(sizes, run_sweep(caches, trace)):
         results[size] = stats
+        print(f"\n--- {size}KB cache ---")
         print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
     return results
 
-def experiment_associativity():
+def experiment_associativity(generator=None):
     """Test different associativity levels"""
     print("\n" + "=" * 60)
     print("🔄 EXPERIMENT 4: Associativity Impact")
     print("=" * 60)
     
-    generator = TraceGenerator()
+    if generator is None:
+        generator = TraceGenerator()
     trace = generator.looping(loop_size=50, loops=20)
     
     associativities = [1, 2, 4, 8]
+    config_names = ["Direct" if assoc == 1 else f"{assoc}-way" for assoc in associativities]
     results = {}
     
-    for assoc in associativities:
-        config_name = "Direct" if assoc == 1 else f"{assoc}-way"
-        print(f"\n--- Testing {config_name} ---")
-        
+    caches = []
+    for assoc, config_name in zip(associativities, config_names):
+        print(f"\n--- Setting up {config_name} ---")
         config = CacheConfig(cache_size_kb=8, block_size_bytes=64, associativity=assoc)
-        cache = Cache(config, policy_name="LRU")
-        
-        for address in trace:
-            cache.access(address)
-        
-        stats = cache.get_stats()
+        caches.append(Cache(config, policy_name="LRU"))
+    
+    for config_name, stats in zip(config_names, run_sweep(caches, trace)):
         results[config_name] = stats
+        print(f"\n--- {config_name} ---")
         print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
     return results
 
-def experiment_memory_patterns():
+def experiment_memory_patterns(generator=None):
     """Test how different memory access patterns affect performance"""
     print("\n" + "=" * 60)
     print("🎭 EXPERIMENT 5: Memory Access Patterns")
     print("=" * 60)
     
-    generator = TraceGenerator()
+    if generator is None:
+        generator = TraceGenerator()
     config = CacheConfig(cache_size_kb=8, block_size_bytes=64, associativity=2)
     results = {}
     
@@ -131,9 +132,7 @@ def experiment_memory_patterns():
     print("\n--- Sequential Pattern ---")
     sequential_trace = generator.sequential(count=1000)
     cache = Cache(config, policy_name="LRU")
-    for address in sequential_trace:
-        cache.access(address)
-    stats = cache.get_stats()
+    stats = cache.run_trace(sequential_trace)
     results["Sequential"] = stats
     print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
@@ -141,9 +140,7 @@ def experiment_memory_patterns():
     print("\n--- Random Pattern ---")
     random_trace = generator.random(count=1000)
     cache = Cache(config, policy_name="LRU")
-    for address in random_trace:
-        cache.access(address)
-    stats = cache.get_stats()
+    stats = cache.run_trace(random_trace)
     results["Random"] = stats
     print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
@@ -151,9 +148,7 @@ def experiment_memory_patterns():
     print("\n--- Looping Pattern ---")
     looping_trace = generator.looping(loop_size=100, loops=10)
     cache = Cache(config, policy_name="LRU")
-    for address in looping_trace:
-        cache.access(address)
-    stats = cache.get_stats()
+    stats = cache.run_trace(looping_trace)
     results["Looping"] = stats
     print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
@@ -161,9 +156,7 @@ def experiment_memory_patterns():
     print("\n--- Mixed Pattern ---")
     mixed_trace = generator.mixed(count=1000)
     cache = Cache(config, policy_name="LRU")
-    for address in mixed_trace:
-        cache.access(address)
-    stats = cache.get_stats()
+    stats = cache.run_trace(mixed_trace)
     results["Mixed"] = stats
     print(f"  Hit rate: {stats['hit_rate']:.2f}%")
     
@@ -175,8 +168,8 @@ def debug_small_example():
     print("🐛 DEBUG: Understanding Cache Sets")
     print("=" * 60)
     
-    config = CacheConfig(cache_size_kb=1, block_size_bytes=16, associativity=2)
-    cache = Cache(config, policy_name="LRU")
+    config = CacheConfig(cache_size_kb=1, block_size_bytes=16, associativity=2, verbose=True)
+    cache = Cache(config, policy_name="LRU", verbose=True)
     
     # Enable debug to see what's happening
     cache.debug_on()
@@ -214,8 +207,8 @@ def run_quick_demo():
     
     # Quick cache demo
     print("\n🎯 Quick Cache Demo:")
-    config = CacheConfig(cache_size_kb=2, block_size_bytes=32, associativity=1)
-    cache = Cache(config, policy_name="LRU")
+    config = CacheConfig(cache_size_kb=2, block_size_bytes=32, associativity=1, verbose=True)
+    cache = Cache(config, policy_name="LRU", verbose=True)
     
     demo_addresses = [0, 32, 64, 0, 32, 96, 128, 0]
     print("  Addresses: [0, 32, 64, 0, 32, 96, 128, 0]")
@@ -238,6 +231,9 @@ def main():
         # Initialize visualizer
         viz = Visualizer()
         
+        # One generator for every experiment, so identical traces are built once
+        generator = TraceGenerator()
+        
         # Quick demo first
         run_quick_demo()
         
@@ -250,16 +246,16 @@ def main():
         cache1 = experiment_basic_functionality()
         
         # Experiment 2: Policy comparison
-        policy_results = experiment_policy_comparison()
+        policy_results = experiment_policy_comparison(generator)
         
         # Experiment 3: Cache size impact
-        size_results = experiment_cache_size_impact()
+        size_results = experiment_cache_size_impact(generator)
         
         # Experiment 4: Associativity
-        assoc_results = experiment_associativity()
+        assoc_results = experiment_associativity(generator)
         
         # Experiment 5: Memory patterns
-        pattern_results = experiment_memory_patterns()
+        pattern_results = experiment_memory_patterns(generator)
         
         # Debug example
         debug_cache = debug_small_example()
@@ -285,11 +281,12 @@ def main():
         viz.create_comprehensive_dashboard(all_results, "Complete Cache Simulation Summary")
         
         # Access pattern visualization
-        if hasattr(cache1, 'access_log') and cache1.access_log:
+        if hasattr(cache1, 'access_log') and len(cache1.access_log):
             viz.plot_access_pattern(cache1.access_log)
         
         # Performance trend across all experiments
         viz.plot_performance_trend(all_results)
+        viz.close()
         
         print("\n🎉 ALL EXPERIMENTS COMPLETED SUCCESSFULLY!")
         print("=" * 60)
@@ -2,14 +2,25 @@
 🔄 Replacement Policies - The Cache's Decision Maker
 🤔 When cache is full, who gets kicked out?
 🎯 Different strategies for different situations
+
+Every set is one array('q') of tags owned by Cache, ordered oldest first:
+for LRU the least recently used block leads, for FIFO the first one in.
+The order *is* the policy state, so a hit is one C-level search and a miss
+is an append (plus a pop(0) once the set is full) - no timestamps, no
+search for a victim. Cache turns these rows into the tag/timestamp arrays
+the compiled kernels use, and back, when it switches between the two.
 """
 
+import numpy as np
+
 class ReplacementPolicy:
     """
     Base class for all replacement policies
     The template for making tough cache decisions
     """
     
+    __slots__ = ('name', 'stats')
+    
     def __init__(self, name):
         self.name = name
         self.stats = {"accesses": 0, "hits": 0}
@@ -19,6 +30,10 @@ class ReplacementPolicy:
         self.stats["accesses"] += 1
         pass
     
+    def prime(self, trace_len, associativity):
+        """Get ready for a batch of trace_len accesses (optional)"""
+        pass
+    
     def get_hit_rate(self):
         """How good is this policy?"""
         if self.stats["accesses"] == 0:
@@ -28,17 +43,29 @@ class ReplacementPolicy:
     def __str__(self):
         return self.name
 
+def _push(blocks, tag, associativity):
+    """Add tag as the newest block, return the oldest one if it had to go"""
+    blocks.append(tag)
+    if len(blocks) > associativity:
+        return blocks.pop(0)
+    return None
+
+# The subclasses count stats["accesses"] themselves rather than calling
+# super().access(): on the per-access path that extra call adds up.
+
 class LRUPolicy(ReplacementPolicy):
     """
     Least Recently Used - the popular kid
     Kicks out the block that hasn't been used in ages
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__("LRU")
     
     def access(self, blocks, tag, associativity):
-        super().access(blocks, tag, associativity)
+        self.stats["accesses"] += 1
         
         # Check if we have this block
         if tag in blocks:
@@ -48,15 +75,8 @@ class LRUPolicy(ReplacementPolicy):
             self.stats["hits"] += 1
             return "HIT", None
         else:
-            # Handle miss
-            if len(blocks) < associativity:
-                blocks.append(tag)
-                return "MISS", None
-            else:
-                # Remove least recently used (oldest)
-                replaced = blocks.pop(0)
-                blocks.append(tag)
-                return "MISS", replaced
+            # Least recently used (the front) goes once the set is full
+            return "MISS", _push(blocks, tag, associativity)
 
 class FIFOPolicy(ReplacementPolicy):
     """
@@ -64,25 +84,45 @@ class FIFOPolicy(ReplacementPolicy):
     Kicks out whoever has been there the longest
     """
     
+    __slots__ = ()
+    
     def __init__(self):
         super().__init__("FIFO")
     
     def access(self, blocks, tag, associativity):
-        super().access(blocks, tag, associativity)
+        self.stats["accesses"] += 1
         
         # FIFO doesn't reorder on hits
         if tag in blocks:
             self.stats["hits"] += 1
             return "HIT", None
         else:
-            if len(blocks) < associativity:
-                blocks.append(tag)
-                return "MISS", None
-            else:
-                # Remove first one in
-                replaced = blocks.pop(0)
-                blocks.append(tag)
-                return "MISS", replaced
+            # Remove first one in
+            return "MISS", _push(blocks, tag, associativity)
+
+class DirectMappedPolicy(ReplacementPolicy):
+    """
+    Direct-mapped - one way per set, nothing to decide
+    Every policy behaves like this at associativity 1, so skip the search
+    """
+    
+    __slots__ = ()
+    
+    def __init__(self):
+        super().__init__("Direct-mapped")
+    
+    def access(self, blocks, tag, associativity):
+        self.stats["accesses"] += 1
+        
+        if not blocks:
+            blocks.append(tag)
+            return "MISS", None
+        old = blocks[0]
+        if old == tag:
+            self.stats["hits"] += 1
+            return "HIT", None
+        blocks[0] = tag
+        return "MISS", old
 
 class RandomPolicy(ReplacementPolicy):
     """
@@ -90,13 +130,23 @@ class RandomPolicy(ReplacementPolicy):
     Completely random replacement
     """
     
-    def __init__(self):
+    __slots__ = ('rng', '_pool', '_cursor')
+    
+    def __init__(self, seed=42):
         super().__init__("Random")
-        import random
-        self.random = random
+        # Fixed default seed: same trace, same victims, same hit rate
+        self.rng = np.random.default_rng(seed)
+        self._pool = []
+        self._cursor = 0
+    
+    def prime(self, trace_len, associativity):
+        """Draw victim indices for a whole batch in one go"""
+        # At most one eviction per access, so trace_len draws is always enough
+        self._pool = self.rng.integers(0, associativity, size=trace_len).tolist()
+        self._cursor = 0
     
     def access(self, blocks, tag, associativity):
-        super().access(blocks, tag, associativity)
+        self.stats["accesses"] += 1
         
         if tag in blocks:
             self.stats["hits"] += 1
@@ -105,9 +155,12 @@ class RandomPolicy(ReplacementPolicy):
             if len(blocks) < associativity:
                 blocks.append(tag)
                 return "MISS", None
-            else:
-                # Randomly pick a victim
-                index = self.random.randint(0, len(blocks) - 1)
-                replaced = blocks[index]
-                blocks[index] = tag
-                return "MISS", replaced
\ No newline at end of file
+            # Randomly pick a victim (pre-drawn by prime()); plain
+            # access() calls are never primed, so refill in bulk too
+            if self._cursor >= len(self._pool):
+                self.prime(max(1024, len(self._pool)), associativity)
+            index = self._pool[self._cursor]
+            self._cursor += 1
+            replaced = blocks[index]
+            blocks[index] = tag
+            return "MISS", replaced
@@ -4,58 +4,82 @@
 🎯 Because real programs don't access memory randomly
 """
 
-import random
+import numpy as np
 
 class TraceGenerator:
     """
     Generate different types of memory access patterns
     See how your cache handles different workloads
+    Traces are remembered per (pattern, arguments): asking twice gives the
+    same read-only array back instead of generating it again.
     """
     
-    def __init__(self, seed=42):
-        random.seed(seed)
+    def __init__(self, seed=42, verbose=False):
+        self.rng = np.random.default_rng(seed)
+        self.verbose = verbose
         self.generated_traces = 0
+        self._trace_cache = {}
+    
+    def _remember(self, key, trace):
+        """Store a finished trace (read-only, since callers share it)"""
+        trace.setflags(write=False)
+        self._trace_cache[key] = trace
+        return trace
     
     def sequential(self, start=0, count=1000, step=4):
         """Sequential access - like scanning an array"""
-        print(f"📈 Sequential: {count} accesses, step {step}")
-        trace = [start + i * step for i in range(count)]
+        key = ('sequential', start, count, step)
+        if key in self._trace_cache:
+            return self._trace_cache[key]
+        if self.verbose:
+            print(f"📈 Sequential: {count} accesses, step {step}")
+        trace = np.arange(start, start + count * step, step, dtype=np.uint64)
         self.generated_traces += 1
-        return trace
+        return self._remember(key, trace)
     
     def random(self, max_address=10000, count=1000):
         """Random access - the worst case for caches"""
-        print(f"🎲 Random: {count} accesses up to {max_address}")
-        trace = [random.randint(0, max_address) for _ in range(count)]
+        key = ('random', max_address, count)
+        if key in self._trace_cache:
+            return self._trace_cache[key]
+        if self.verbose:
+            print(f"🎲 Random: {count} accesses up to {max_address}")
+        trace = self.rng.integers(0, max_address, size=count, endpoint=True,
+                                  dtype=np.uint64)
         self.generated_traces += 1
-        return trace
+        return self._remember(key, trace)
     
     def looping(self, loop_size=100, loops=10, stride=4):
         """Looping pattern - common in programs"""
-        print(f"🔄 Looping: {loops} loops of {loop_size} accesses")
-        trace = []
-        for loop in range(loops):
-            for i in range(loop_size):
-                address = (i * stride) % (loop_size * stride)
-                trace.append(address)
+        key = ('looping', loop_size, loops, stride)
+        if key in self._trace_cache:
+            return self._trace_cache[key]
+        if self.verbose:
+            print(f"🔄 Looping: {loops} loops of {loop_size} accesses")
+        one_loop = np.arange(loop_size, dtype=np.uint64) * np.uint64(stride)
+        trace = np.tile(one_loop, loops)
         self.generated_traces += 1
-        return trace
+        return self._remember(key, trace)
     
     def mixed(self, count=2000):
         """Mixed pattern - more like real programs"""
-        print(f"🌈 Mixed: {count} realistic accesses")
+        key = ('mixed', count)
+        if key in self._trace_cache:
+            return self._trace_cache[key]
+        if self.verbose:
+            print(f"🌈 Mixed: {count} realistic accesses")
         
         # Combine different patterns
         seq = self.sequential(0, count//3, 4)
-        rand = [random.randint(0, 5000) for _ in range(count//3)]
+        rand = self.rng.integers(0, 5000, size=count//3, endpoint=True,
+                                 dtype=np.uint64)
         loop = self.looping(50, count//150)
         
         # Shuffle them together
-        trace = seq + rand + loop
-        random.shuffle(trace)
+        trace = self.rng.permutation(np.concatenate((seq, rand, loop)))
         
         self.generated_traces += 1
-        return trace[:count]
+        return self._remember(key, trace[:count])
     
     def save_trace(self, filename, addresses):
         """Save trace to file for later use"""
@@ -63,7 +87,8 @@ class TraceGenerator:
             with open(filename, 'w') as f:
                 for addr in addresses:
                     f.write(f"{addr}\n")
-            print(f"💾 Saved: {filename} ({len(addresses)} addresses)")
+            if self.verbose:
+                print(f"💾 Saved: {filename} ({len(addresses)} addresses)")
             return True
         except Exception as e:
             print(f"❌ Save failed: {e}")
@@ -78,7 +103,8 @@ class TraceGenerator:
                     line = line.strip()
                     if line:
                         addresses.append(int(line))
-            print(f"📁 Loaded: {filename} ({len(addresses)} addresses)")
+            if self.verbose:
+                print(f"📁 Loaded: {filename} ({len(addresses)} addresses)")
             return addresses
         except FileNotFoundError:
             print(f"❌ File not found: {filename}")
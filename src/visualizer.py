@@ -4,10 +4,148 @@
 📈 Because boring data doesn't help anyone learn
 """
 
+import os
+import sys
+import pickle
+import hashlib
+import matplotlib
+# Nobody can see a window when output is piped or redirected: render with Agg
+# (has to happen before pyplot is imported; an explicit MPLBACKEND still wins)
+if os.environ.get('MPLBACKEND') is None and not (sys.stdout and sys.stdout.isatty()):
+    matplotlib.use('Agg')
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.patches import FancyBboxPatch
 import matplotlib.colors as mcolors
+from itertools import compress, cycle, islice
+from operator import itemgetter
+from cache import LOG_DTYPE  # access-log record layout (result: 1 = HIT)
+try:
+    # Optional: rasterize huge access logs instead of scattering every point
+    import datashader as ds
+    import datashader.transfer_functions as tf
+    import pandas as pd
+    DATASHADER_AVAILABLE = True
+except ImportError:
+    DATASHADER_AVAILABLE = False
+
+# Modern, vibrant color palette (a tuple: shared by every Visualizer)
+PALETTE = (
+    '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
+    '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9'
+)
+
+_STYLE_APPLIED = False
+
+# Modern, clean axes: one ax.update() plus grid and grouped spine calls
+_AXIS_STYLE = {'facecolor': '#f8f9fa'}
+_GRID_STYLE = {'alpha': 0.3, 'color': 'gray', 'linestyle': '-', 'linewidth': 0.5}
+
+# Where the pickled dashboard skeleton lives unless Visualizer is told otherwise
+_TEMPLATE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache'),
+    'cache-simulator')
+# Bump whenever _style_axis or _dashboard_figure change what a template holds
+_TEMPLATE_VERSION = 1
+
+
+def _apply_style():
+    """Set the modern rcParams once per process, not once per Visualizer"""
+    global _STYLE_APPLIED
+    if _STYLE_APPLIED:
+        return
+    plt.style.use('default')
+    plt.rcParams['font.family'] = 'DejaVu Sans'
+    plt.rcParams['font.size'] = 11
+    plt.rcParams['axes.titleweight'] = 'bold'
+    plt.rcParams['axes.labelweight'] = 'bold'
+    _STYLE_APPLIED = True
+
+
+def _style_axis(ax):
+    """Background, grid and spines - everything but the title"""
+    ax.update(_AXIS_STYLE)
+    ax.grid(True, **_GRID_STYLE)
+    ax.spines[['top', 'right']].set_visible(False)
+    ax.spines[['left', 'bottom']].set_color('#cccccc')
+
+
+def _log_record(entry):
+    """A dict entry or an (address, hit, set) tuple -> one LOG_DTYPE record"""
+    if isinstance(entry, dict):
+        return (entry['address'], entry['result'] == 'HIT', entry.get('set', 0))
+    return tuple(entry)
+
+
+def _as_log_array(access_log, chunk=65536):
+    """
+    Any access log as a structured array (arrays pass straight through)
+    Iterables are read chunk by chunk, so a generator never has to become
+    a full list of Python objects first
+    """
+    if isinstance(access_log, np.ndarray):
+        return access_log
+    entries = iter(access_log)
+    chunks = []
+    while True:
+        block = np.fromiter(map(_log_record, islice(entries, chunk)), dtype=LOG_DTYPE)
+        if not len(block):
+            break
+        chunks.append(block)
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=LOG_DTYPE)
+
+
+def _lttb(xs, ys, n_out):
+    """
+    Largest-Triangle-Three-Buckets downsampling
+    Returns the indices of n_out points that keep the visual shape of (xs, ys):
+    per bucket, the point spanning the biggest triangle with the last pick and
+    the next bucket's average - so peaks and outliers survive, unlike [::step]
+    """
+    n = len(xs)
+    if n <= n_out:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:n_out], dtype=np.intp)
+    
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    # First and last points are always kept; the rest go in n_out - 2 buckets
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0] = 0
+    selected[-1] = n - 1
+    
+    a = 0
+    for b in range(n_out - 2):
+        lo, hi = edges[b], edges[b + 1]
+        next_lo = hi
+        next_hi = edges[b + 2] if b + 2 < len(edges) else n
+        cx = xs[next_lo:next_hi].mean()
+        cy = ys[next_lo:next_hi].mean()
+        area = np.abs((xs[a] - cx) * (ys[lo:hi] - ys[a])
+                      - (xs[a] - xs[lo:hi]) * (cy - ys[a]))
+        a = lo + int(np.argmax(area))
+        selected[b + 1] = a
+    return selected
+
+
+def _top_k(rates, k):
+    """
+    Indices of the k highest rates, best first - same picks and order as
+    sorted(range(n), key=lambda i: -rates[i])[:k], ties going to the lower index
+    """
+    rates = np.asarray(rates, dtype=float)
+    k = min(k, len(rates))
+    if k == 0:
+        return np.empty(0, dtype=np.intp)
+    # The partition only finds the kth value; argpartition's order among
+    # ties is arbitrary, so the tied slots are filled by index instead
+    kth = np.partition(rates, -k)[-k]
+    above = np.flatnonzero(rates > kth)
+    ties = np.flatnonzero(rates == kth)[:k - len(above)]
+    idx = np.concatenate((above, ties))
+    return idx[np.lexsort((idx, -rates[idx]))]
 
 class Visualizer:
     """
@@ -15,94 +153,143 @@ class Visualizer:
     Perfect for presentations, reports, and showing off your skills
     """
     
-    def __init__(self):
-        # Modern, vibrant color palette
-        self.colors = [
-            '#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4', '#FFEAA7',
-            '#DDA0DD', '#98D8C8', '#F7DC6F', '#BB8FCE', '#85C1E9'
-        ]
-        
-        # Set modern style
-        plt.style.use('default')
-        plt.rcParams['font.family'] = 'DejaVu Sans'
-        plt.rcParams['font.size'] = 11
-        plt.rcParams['axes.titleweight'] = 'bold'
-        plt.rcParams['axes.labelweight'] = 'bold'
+    def __init__(self, template_dir=_TEMPLATE_DIR):
+        """
+        template_dir: where the styled, empty dashboard is pickled and reused
+                      across runs (default ~/.cache/cache-simulator, or under
+                      $XDG_CACHE_HOME); None keeps everything in memory
+        """
+        self.colors = PALETTE
+        
+        # Set modern style (no-op after the first Visualizer)
+        _apply_style()
+        
+        # (method, figsize, layout) -> (Figure, [Axes]), reused across calls
+        self._fig_cache = {}
+        # Styled, empty dashboard pickled by the first run (per user - a pickle
+        # is only safe to load from our own dir). The name carries a hash of
+        # everything baked into it, so a changed layout or style misses
+        self._dashboard_template_path = None
+        if template_dir is not None:
+            self._dashboard_template_path = os.path.join(
+                template_dir, f'dashboard-{self._dashboard_key()}.pkl')
         
         print("🎨 Ultimate Visualizer activated! Get ready for stunning graphs! 🌟")
     
+    def _get_figure(self, name, figsize, nrows=1, ncols=1, make_axes=None):
+        """
+        Hand back a cached figure with cleared axes, or build a new one
+        make_axes(fig) -> [Axes] builds custom layouts (default: nrows x ncols)
+        """
+        key = (name, figsize, nrows * ncols)
+        cached = self._fig_cache.get(key)
+        # A figure whose window was closed is gone for good - rebuild it
+        if cached is not None and plt.fignum_exists(cached[0].number):
+            fig, axes = cached
+            for ax in axes:
+                ax.clear()
+            return fig, axes
+        
+        # Constrained layout solves once per draw - no tight_layout() pass
+        fig = plt.figure(figsize=figsize, layout='constrained')
+        if make_axes is None:
+            axes = list(np.atleast_1d(fig.subplots(nrows, ncols)).ravel())
+        else:
+            axes = make_axes(fig)
+        self._fig_cache[key] = (fig, axes)
+        return fig, axes
+    
+    def _show(self, fig):
+        """Redraw in place when interactive, otherwise show as before"""
+        if plt.isinteractive():
+            fig.canvas.draw_idle()
+        elif matplotlib.get_backend().lower() != 'agg':
+            plt.show()  # Agg has no window to show
+    
+    def close(self):
+        """Close every cached figure and forget it"""
+        for fig, _ in self._fig_cache.values():
+            plt.close(fig)
+        self._fig_cache.clear()
+    
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass  # interpreter shutdown: pyplot may already be gone
+    
     def _create_modern_axis(self, ax, title):
         """Helper to create modern, clean axes"""
-        ax.set_facecolor('#f8f9fa')
-        ax.grid(True, alpha=0.3, color='gray', linestyle='-', linewidth=0.5)
-        ax.spines['top'].set_visible(False)
-        ax.spines['right'].set_visible(False)
-        ax.spines['left'].set_color('#cccccc')
-        ax.spines['bottom'].set_color('#cccccc')
+        _style_axis(ax)
         ax.set_title(title, fontsize=14, fontweight='bold', pad=20, color='#2c3e50')
         return ax
     
+    def _cycle_colors(self, n):
+        """The first n palette colors, wrapping around - fresh for every plot"""
+        return list(islice(cycle(self.colors), n))
+    
+    def _plain_labels(self, ax, xs, ys, strings, **kw):
+        """One ax.text per label, just without a bbox (the FancyBboxPatch is the slow part)"""
+        return [ax.text(x, y, text, **kw) for x, y, text in zip(xs, ys, strings)]
+    
     def plot_policy_comparison(self, policy_results):
         """Compare replacement policies with stunning visuals"""
         print("   🎯 Generating Policy Comparison - Which one wins?")
         
         policies = list(policy_results.keys())
-        hit_rates = [policy_results[p]['hit_rate'] for p in policies]
+        hit_rates = np.fromiter(map(itemgetter('hit_rate'), policy_results.values()),
+                                dtype=float, count=len(policy_results))
         
         # Create figure with modern styling
-        fig, ax = plt.subplots(figsize=(12, 7))
+        fig, (ax,) = self._get_figure('policy_comparison', (12, 7))
         ax = self._create_modern_axis(ax, '🏆 Replacement Policy Showdown')
         
-        # Create gradient bars
-        gradient_bars = []
-        for i, (policy, rate) in enumerate(zip(policies, hit_rates)):
-            color = self.colors[i % len(self.colors)]
-            gradient = self._create_gradient(color, 0.7, 1.0)
-            
-            bar = ax.bar(i, rate, color=gradient, edgecolor=color, linewidth=2, 
-                        alpha=0.9, width=0.7)
-            gradient_bars.append(bar)
-            
-            # Add value with emoji indicator
-            emoji = "🔥" if rate > 75 else "👍" if rate > 60 else "💤"
-            ax.text(i, rate + 1, f'{rate:.1f}% {emoji}', 
-                   ha='center', va='bottom', fontweight='bold', fontsize=12,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.8))
+        # Create gradient bars - all of them in one call
+        edge_colors = self._cycle_colors(len(hit_rates))
+        gradients = [self._create_gradient(color, 0.7, 1.0) for color in edge_colors]
+        bars = ax.bar(np.arange(len(hit_rates)), hit_rates, color=gradients,
+                      edgecolor=edge_colors, linewidth=2, alpha=0.9, width=0.7,
+                      rasterized=True)
+        
+        # Add value with emoji indicator
+        ax.bar_label(bars, labels=[
+            f'{rate:.1f}% {"🔥" if rate > 75 else "👍" if rate > 60 else "💤"}'
+            for rate in hit_rates
+        ], padding=3, fontweight='bold', fontsize=12)
         
         ax.set_xticks(range(len(policies)))
         ax.set_xticklabels([f'📊 {p}' for p in policies], fontsize=12)
         ax.set_ylabel('Hit Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_ylim(0, max(hit_rates) * 1.15)
+        best = int(hit_rates.argmax())  # one pass for the winner and the scale
+        best_policy, best_rate = policies[best], hit_rates[best]
+        ax.set_ylim(0, best_rate * 1.15)
         
         # Add performance assessment
-        best_policy = policies[np.argmax(hit_rates)]
-        best_rate = max(hit_rates)
         ax.text(0.5, 0.95, f'🏅 Winner: {best_policy} ({best_rate:.1f}%)', 
                transform=ax.transAxes, ha='center', fontsize=13, fontweight='bold',
                bbox=dict(boxstyle="round,pad=0.5", facecolor='gold', alpha=0.9))
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
     
     def plot_size_sensitivity(self, size_results):
         """Show cache size impact with beautiful line chart"""
         print("   💾 Generating Size Impact - Does bigger mean better?")
         
         sizes = list(size_results.keys())
-        hit_rates = [size_results[s]['hit_rate'] for s in sizes]
+        hit_rates = np.fromiter(map(itemgetter('hit_rate'), size_results.values()),
+                                dtype=float, count=len(size_results))
         
-        fig, ax = plt.subplots(figsize=(12, 7))
+        fig, (ax,) = self._get_figure('size_sensitivity', (12, 7))
         ax = self._create_modern_axis(ax, '📈 Cache Size: Bigger = Better?')
         
         # Create gradient line with markers
         x_pos = np.arange(len(sizes))
         
-        # Main line with gradient
-        for i in range(len(sizes)-1):
-            ax.plot(x_pos[i:i+2], hit_rates[i:i+2], 
-                   color=self.colors[1], linewidth=4, alpha=0.8,
-                   marker='o', markersize=10, markerfacecolor='white',
-                   markeredgecolor=self.colors[1], markeredgewidth=3)
+        # Main line - one Line2D for every point
+        ax.plot(x_pos, hit_rates,
+               color=self.colors[1], linewidth=4, alpha=0.8,
+               marker='o', markersize=10, markerfacecolor='white',
+               markeredgecolor=self.colors[1], markeredgewidth=3)
         
         # Annotate each point with insights
         for i, (size, rate) in enumerate(zip(sizes, hit_rates)):
@@ -126,7 +313,7 @@ class Visualizer:
         ax.set_xticks(x_pos)
         ax.set_xticklabels([f'💾 {s}KB' for s in sizes])
         ax.set_ylabel('Hit Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_ylim(min(hit_rates) * 0.9, max(hit_rates) * 1.1)
+        ax.set_ylim(hit_rates.min() * 0.9, hit_rates.max() * 1.1)
         
         # Add overall trend insight
         trend = "📈 Positive" if hit_rates[-1] > hit_rates[0] else "📉 Negative"
@@ -134,78 +321,111 @@ class Visualizer:
                transform=ax.transAxes, fontsize=12, fontweight='bold',
                bbox=dict(boxstyle="round,pad=0.5", facecolor='lightblue', alpha=0.9))
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
     
     def plot_associativity_impact(self, assoc_results):
         """Show associativity impact with engaging visualization"""
         print("   🔄 Generating Associativity Impact - More ways, more better?")
         
         configs = list(assoc_results.keys())
-        hit_rates = [assoc_results[c]['hit_rate'] for c in configs]
+        hit_rates = np.fromiter(map(itemgetter('hit_rate'), assoc_results.values()),
+                                dtype=float, count=len(assoc_results))
+        
+        best = int(hit_rates.argmax())  # one pass for the winner and the scale
+        top = hit_rates[best]
         
-        fig, ax = plt.subplots(figsize=(12, 7))
+        fig, (ax,) = self._get_figure('associativity_impact', (12, 7))
         ax = self._create_modern_axis(ax, '🔄 Associativity: Finding the Sweet Spot')
         
-        # Create bars with different styles based on associativity
-        for i, (config, rate) in enumerate(zip(configs, hit_rates)):
+        # Different styles based on associativity, drawn in a single call
+        # (per-bar alpha lives in the RGBA colors)
+        face_colors = []
+        edge_colors = []
+        for config in configs:
             if "Direct" in config:
                 # Direct mapped - simple bar
-                bar = ax.bar(i, rate, color=self.colors[0], alpha=0.8, width=0.6)
+                face_colors.append(mcolors.to_rgba(self.colors[0], 0.8))
+                edge_colors.append('none')
             else:
                 # Associative - fancy gradient bar
                 ways = int(config.split('-')[0])
                 gradient = self._create_gradient(self.colors[min(ways, 5)], 0.6, 0.9)
-                bar = ax.bar(i, rate, color=gradient, alpha=0.9, width=0.6,
-                           edgecolor=self.colors[min(ways, 5)], linewidth=2)
-            
-            # Add configuration label and value
-            label = "🎯 Direct" if "Direct" in config else f"🔄 {config}"
-            ax.text(i, rate + 1, f'{rate:.1f}%', 
-                   ha='center', va='bottom', fontweight='bold', fontsize=11,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.9))
-            
-            ax.text(i, -max(hit_rates)*0.08, label, 
-                   ha='center', va='top', fontweight='bold', fontsize=10,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgray', alpha=0.7))
+                face_colors.append(mcolors.to_rgba(gradient, 0.9))
+                edge_colors.append(self.colors[min(ways, 5)])
+        bars = ax.bar(np.arange(len(configs)), hit_rates, color=face_colors,
+                      edgecolor=edge_colors, linewidth=2, width=0.6, rasterized=True)
+        
+        # Add configuration label and value
+        ax.bar_label(bars, labels=[f'{rate:.1f}%' for rate in hit_rates],
+                     padding=3, fontweight='bold', fontsize=11)
+        labels = ["🎯 Direct" if "Direct" in config else f"🔄 {config}"
+                  for config in configs]
+        self._plain_labels(ax, range(len(configs)),
+                           [-top * 0.08] * len(configs), labels,
+                           ha='center', va='top', fontweight='bold', fontsize=10)
         
         ax.set_xticks([])  # Remove x-ticks since we have custom labels
         ax.set_ylabel('Hit Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_ylim(0, max(hit_rates) * 1.15)
+        ax.set_ylim(0, top * 1.15)
         
         # Add performance insight
-        best_config = configs[np.argmax(hit_rates)]
+        best_config = configs[best]
         ax.text(0.5, 0.92, f'💡 Best: {best_config}', 
                transform=ax.transAxes, ha='center', fontsize=12, fontweight='bold',
                bbox=dict(boxstyle="round,pad=0.5", facecolor='lightgreen', alpha=0.9))
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
     
-    def plot_access_pattern(self, access_log, max_points=200):
-        """Visualize memory access patterns in a stunning way"""
+    def plot_access_pattern(self, access_log, max_points=200, backend='matplotlib',
+                            raster_threshold=100_000):
+        """
+        Visualize memory access patterns in a stunning way
+        access_log: structured array with 'address', 'result' (1 = HIT), 'set',
+                    or any iterable of such dicts / (address, hit, set) tuples
+        backend='datashader' rasterizes every access once the log is longer
+        than raster_threshold (falls back to the scatter without datashader)
+        """
+        if backend not in ('matplotlib', 'datashader'):
+            raise ValueError(f"backend must be 'matplotlib' or 'datashader', not {backend!r}")
         print("   🎭 Generating Access Pattern - Watch the cache dance!")
         
-        if len(access_log) > max_points:
-            step = len(access_log) // max_points
-            sampled_log = access_log[::step]
-        else:
-            sampled_log = access_log
+        access_log = _as_log_array(access_log)
+        hit_mask = access_log['result'] == 1  # the one HIT/MISS pass
+        raster = (backend == 'datashader' and DATASHADER_AVAILABLE
+                  and len(access_log) > raster_threshold)
         
-        addresses = [entry['address'] for entry in sampled_log]
-        results = [entry['result'] for entry in sampled_log]
-        sets = [entry.get('set', 0) for entry in sampled_log]
-        
-        fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+        fig, (ax1, ax2) = self._get_figure('access_pattern', (14, 10), nrows=2)
         
         # Plot 1: Access pattern over time
         ax1 = self._create_modern_axis(ax1, '🕒 Memory Access Timeline')
         
-        colors = ['#4ECDC4' if result == 'HIT' else '#FF6B6B' for result in results]
-        sizes = [30 if result == 'HIT' else 50 for result in results]  # Misses are bigger
-        
-        scatter = ax1.scatter(range(len(addresses)), addresses, c=colors, s=sizes, 
-                            alpha=0.7, edgecolors='white', linewidth=0.5)
+        if raster:
+            self._raster_access_pattern(ax1, access_log, hit_mask)
+        else:
+            # Downsample hits and misses separately with LTTB, each with its
+            # share of the budget, so the extremes of both classes survive
+            seq = np.arange(len(access_log))
+            if len(access_log) > max_points:
+                keep = []
+                for mask in (hit_mask, ~hit_mask):
+                    idx = np.flatnonzero(mask)
+                    budget = max(round(max_points * len(idx) / len(access_log)), 3)
+                    keep.append(idx[_lttb(idx, access_log['address'][idx], budget)])
+                seq = np.sort(np.concatenate(keep))
+            sampled_log = access_log[seq]
+            
+            # Structured array (LOG_DTYPE): every per-point quantity
+            # below is one NumPy pass over a field
+            addresses = sampled_log['address']
+            is_hit = hit_mask[seq]
+            
+            # One uniformly styled collection per class draws faster than a
+            # single collection with per-point colors and sizes
+            for mask, color, size in ((is_hit, '#4ECDC4', 30),
+                                      (~is_hit, '#FF6B6B', 50)):  # Misses are bigger
+                ax1.scatter(seq[mask], addresses[mask], c=color, s=size,
+                            alpha=0.7, edgecolors='white', linewidth=0.5,
+                            rasterized=True)
         
         ax1.set_xlabel('Access Sequence', fontsize=11, fontweight='bold')
         ax1.set_ylabel('Memory Address', fontsize=11, fontweight='bold')
@@ -221,12 +441,13 @@ class Visualizer:
         # Plot 2: Hit/Miss distribution
         ax2 = self._create_modern_axis(ax2, '📊 Hit/Miss Distribution')
         
-        hit_count = results.count('HIT')
-        miss_count = results.count('MISS')
-        total = len(results)
+        # Counts come from the full log - the scatter above may be sampled
+        total = len(hit_mask)
+        hit_count = int(hit_mask.sum())
+        miss_count = total - hit_count
         
         hit_percent = (hit_count / total) * 100
-        miss_percent = (miss_count / total) * 100
+        miss_percent = 100 - hit_percent
         
         wedges, texts, autotexts = ax2.pie([hit_count, miss_count], 
                                           labels=[f'Hits: {hit_percent:.1f}%', 
@@ -247,123 +468,214 @@ class Visualizer:
                 ha='center', va='center', fontweight='bold', fontsize=12,
                 bbox=dict(boxstyle="round,pad=0.8", facecolor='gold', alpha=0.8))
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
+    
+    # Dashboard layout by name: three small plots on top, two full-width rows
+    _DASHBOARD_MOSAIC = [['policy', 'size', 'assoc'],
+                         ['pattern', 'pattern', 'pattern'],
+                         ['rank', 'rank', 'rank']]
+    
+    # Layout-engine rect for the dashboard: leaves room for the suptitle
+    _DASHBOARD_RECT = (0, 0, 1, 0.92)
+    
+    # Past this many configs a dashboard bar panel becomes a histogram
+    _BAR_LIMIT = 50
+    
+    @classmethod
+    def _dashboard_key(cls):
+        """Short hash of the layout, style and matplotlib version in a template"""
+        baked = repr((_TEMPLATE_VERSION, matplotlib.__version__, cls._DASHBOARD_MOSAIC,
+                      cls._DASHBOARD_RECT, sorted(_AXIS_STYLE.items()),
+                      sorted(_GRID_STYLE.items())))
+        return hashlib.sha1(baked.encode()).hexdigest()[:12]
+    
+    @classmethod
+    def _dashboard_axes(cls, fig):
+        """Build the whole dashboard grid in one subplot_mosaic call"""
+        axd = fig.subplot_mosaic(cls._DASHBOARD_MOSAIC)
+        return [axd[name] for name in ('policy', 'size', 'assoc', 'pattern', 'rank')]
+    
+    def _dashboard_figure(self):
+        """
+        The dashboard with its five axes styled and empty
+        Reused in-process like _get_figure; across runs the styled skeleton
+        is unpickled from a template instead of being laid out again
+        """
+        key = ('dashboard', (16, 12), 5)
+        cached = self._fig_cache.get(key)
+        if cached is not None and plt.fignum_exists(cached[0].number):
+            fig, axes = cached
+            for ax in axes:
+                ax.clear()
+                _style_axis(ax)
+            return fig, axes
+        
+        path = self._dashboard_template_path
+        fig = None
+        if path is not None:
+            try:
+                with open(path, 'rb') as f:
+                    fig, axes = pickle.load(f)
+            except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+                pass  # no template yet, or a truncated / incompatible one
+        
+        if fig is None:
+            fig = plt.figure(figsize=(16, 12), layout='constrained')
+            fig.get_layout_engine().set(rect=self._DASHBOARD_RECT)
+            axes = self._dashboard_axes(fig)
+            for ax in axes:
+                _style_axis(ax)
+            if path is not None:
+                try:
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    with open(path, 'wb') as f:
+                        pickle.dump((fig, axes), f)
+                except OSError:
+                    pass  # read-only cache dir: just build it again next time
+        
+        self._fig_cache[key] = (fig, axes)
+        return fig, axes
+    
+    def _raster_access_pattern(self, ax, access_log, hit_mask):
+        """Shade every (sequence, address) point with datashader, then blit it"""
+        n = len(access_log)
+        addresses = access_log['address'].astype(np.float64)
+        low, high = addresses.min(), addresses.max()
+        if high == low:
+            high = low + 1
+        
+        df = pd.DataFrame({
+            'seq': np.arange(n, dtype=np.float64),
+            'address': addresses,
+            'result': pd.Categorical.from_codes(np.where(hit_mask, 0, 1),
+                                                categories=['HIT', 'MISS']),
+        })
+        canvas = ds.Canvas(plot_width=1200, plot_height=400,
+                           x_range=(0, n - 1), y_range=(low, high))
+        agg = canvas.points(df, 'seq', 'address', ds.count_cat('result'))
+        img = tf.shade(agg, color_key={'HIT': '#4ECDC4', 'MISS': '#FF6B6B'})
+        ax.imshow(img.to_pil(), aspect='auto', extent=(0, n - 1, low, high))
+    
+    def _hist_panel(self, ax, hit_rates, color):
+        """Too many configs for bars: one filled histogram of their hit rates"""
+        ax.hist(hit_rates, bins=30, histtype='stepfilled', color=color,
+                alpha=0.8, rasterized=True)
+        ax.set_xlabel('Hit Rate (%)')
+        ax.set_ylabel('Configurations')
     
     def create_comprehensive_dashboard(self, all_results, title="🎯 Cache Performance Master Dashboard"):
         """Create an ultimate dashboard that tells the complete story"""
         print("   🚀 Generating Master Dashboard - The Big Picture!")
         
-        fig = plt.figure(figsize=(16, 12))
+        # Axes arrive styled; subplot titles stay small
+        fig, (ax1, ax2, ax3, ax4, ax5) = self._dashboard_figure()
         fig.suptitle(title, fontsize=18, fontweight='bold', color='#2c3e50', y=0.95)
         
-        # Create a 2x2 grid with some spanning
-        gs = fig.add_gridspec(3, 3)
-        
-        # Extract different types of results
-        policy_results = {k: v for k, v in all_results.items() if k.startswith('Policy_')}
-        size_results = {k: v for k, v in all_results.items() if k.startswith('Size_')}
-        assoc_results = {k: v for k, v in all_results.items() if k.startswith('Assoc_')}
-        pattern_results = {k: v for k, v in all_results.items() if k.startswith('Pattern_')}
+        # Every hit rate read once; each panel takes its slice by key prefix
+        all_keys = list(all_results)
+        all_rates = np.fromiter(map(itemgetter('hit_rate'), all_results.values()),
+                                dtype=float, count=len(all_keys))
+        groups = {}
+        for prefix in ('Policy_', 'Size_', 'Assoc_', 'Pattern_'):
+            mask = np.fromiter((k.startswith(prefix) for k in all_keys),
+                               dtype=bool, count=len(all_keys))
+            groups[prefix] = ([k[len(prefix):] for k in compress(all_keys, mask)],
+                              all_rates[mask])
         
         # Plot 1: Policy Comparison (top left)
-        ax1 = fig.add_subplot(gs[0, 0])
-        if policy_results:
-            policies = [k.replace('Policy_', '') for k in policy_results.keys()]
-            hit_rates = [policy_results[p]['hit_rate'] for p in policy_results.keys()]
-            
-            bars = ax1.bar(range(len(policies)), hit_rates, 
-                          color=self.colors[:len(policies)], alpha=0.8)
-            ax1.set_title('🏆 Policy Showdown', fontweight='bold', fontsize=12)
-            ax1.set_ylabel('Hit Rate (%)')
-            ax1.set_xticks(range(len(policies)))
-            ax1.set_xticklabels(policies, rotation=45)
-            
-            for bar, rate in zip(bars, hit_rates):
-                ax1.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                        f'{rate:.1f}%', ha='center', va='bottom', fontweight='bold')
+        policies, hit_rates = groups['Policy_']
+        if policies:
+            ax1.set_title('🏆 Policy Showdown', fontweight='bold', fontsize=11, color='#2c3e50')
+            if len(policies) > self._BAR_LIMIT:
+                self._hist_panel(ax1, hit_rates, self.colors[0])
+            else:
+                bars = ax1.bar(range(len(policies)), hit_rates, 
+                              color=self.colors[:len(policies)], alpha=0.8,
+                              rasterized=True)
+                ax1.set_ylabel('Hit Rate (%)')
+                ax1.set_xticks(range(len(policies)))
+                ax1.set_xticklabels(policies, rotation=45)
+                
+                ax1.bar_label(bars, labels=[f'{rate:.1f}%' for rate in hit_rates],
+                              padding=3, fontweight='bold')
         
         # Plot 2: Size Impact (top middle)
-        ax2 = fig.add_subplot(gs[0, 1])
-        if size_results:
-            sizes = [int(k.replace('Size_', '').replace('KB', '')) for k in size_results.keys()]
-            hit_rates = [size_results[s]['hit_rate'] for s in size_results.keys()]
+        size_names, hit_rates = groups['Size_']
+        if size_names:
+            sizes = [int(name.replace('KB', '')) for name in size_names]
             
             ax2.plot(sizes, hit_rates, 'o-', linewidth=3, markersize=8, 
                     color=self.colors[1], markerfacecolor='white')
-            ax2.set_title('💾 Size Matters', fontweight='bold', fontsize=12)
+            ax2.set_title('💾 Size Matters', fontweight='bold', fontsize=11, color='#2c3e50')
             ax2.set_xlabel('Cache Size (KB)')
             ax2.set_ylabel('Hit Rate (%)')
         
         # Plot 3: Associativity (top right)
-        ax3 = fig.add_subplot(gs[0, 2])
-        if assoc_results:
-            configs = [k.replace('Assoc_', '') for k in assoc_results.keys()]
-            hit_rates = [assoc_results[c]['hit_rate'] for c in assoc_results.keys()]
-            
-            bars = ax3.bar(range(len(configs)), hit_rates, color=self.colors[2], alpha=0.8)
-            ax3.set_title('🔄 Associativity Impact', fontweight='bold', fontsize=12)
-            ax3.set_ylabel('Hit Rate (%)')
-            ax3.set_xticks(range(len(configs)))
-            ax3.set_xticklabels(configs)
-            
-            for bar, rate in zip(bars, hit_rates):
-                ax3.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                        f'{rate:.1f}%', ha='center', va='bottom', fontweight='bold')
+        configs, hit_rates = groups['Assoc_']
+        if configs:
+            ax3.set_title('🔄 Associativity Impact', fontweight='bold', fontsize=11, color='#2c3e50')
+            if len(configs) > self._BAR_LIMIT:
+                self._hist_panel(ax3, hit_rates, self.colors[2])
+            else:
+                bars = ax3.bar(range(len(configs)), hit_rates, color=self.colors[2], alpha=0.8,
+                               rasterized=True)
+                ax3.set_ylabel('Hit Rate (%)')
+                ax3.set_xticks(range(len(configs)))
+                ax3.set_xticklabels(configs)
+                
+                ax3.bar_label(bars, labels=[f'{rate:.1f}%' for rate in hit_rates],
+                              padding=3, fontweight='bold')
         
         # Plot 4: Pattern Comparison (bottom left - spans 2 columns)
-        ax4 = fig.add_subplot(gs[1, :])
-        if pattern_results:
-            patterns = [k.replace('Pattern_', '') for k in pattern_results.keys()]
-            hit_rates = [pattern_results[p]['hit_rate'] for p in pattern_results.keys()]
-            
-            bars = ax4.bar(range(len(patterns)), hit_rates, 
-                          color=self.colors[3:3+len(patterns)], alpha=0.8)
-            ax4.set_title('🎭 Memory Access Patterns', fontweight='bold', fontsize=12)
-            ax4.set_ylabel('Hit Rate (%)')
-            ax4.set_xticks(range(len(patterns)))
-            ax4.set_xticklabels(patterns)
-            
-            for bar, rate in zip(bars, hit_rates):
-                ax4.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                        f'{rate:.1f}%', ha='center', va='bottom', fontweight='bold')
+        patterns, hit_rates = groups['Pattern_']
+        if patterns:
+            ax4.set_title('🎭 Memory Access Patterns', fontweight='bold', fontsize=11, color='#2c3e50')
+            if len(patterns) > self._BAR_LIMIT:
+                self._hist_panel(ax4, hit_rates, self.colors[3])
+            else:
+                bars = ax4.bar(range(len(patterns)), hit_rates, 
+                              color=self.colors[3:3+len(patterns)], alpha=0.8,
+                              rasterized=True)
+                ax4.set_ylabel('Hit Rate (%)')
+                ax4.set_xticks(range(len(patterns)))
+                ax4.set_xticklabels(patterns)
+                
+                ax4.bar_label(bars, labels=[f'{rate:.1f}%' for rate in hit_rates],
+                              padding=3, fontweight='bold')
         
         # Plot 5: Overall Ranking (bottom right)
-        ax5 = fig.add_subplot(gs[2, :])
         if all_results:
-            # Get top 8 performers
-            sorted_results = sorted(all_results.items(), key=lambda x: x[1]['hit_rate'], reverse=True)[:8]
-            config_names = [k for k, v in sorted_results]
-            hit_rates = [v['hit_rate'] for k, v in sorted_results]
+            # Get top 8 performers: partition, then sort just those 8
+            top_idx = _top_k(all_rates, 8)
+            config_names = [all_keys[i] for i in top_idx]
+            hit_rates = all_rates[top_idx]
             
             y_pos = np.arange(len(config_names))
-            bars = ax5.barh(y_pos, hit_rates, color=self.colors[5], alpha=0.8)
-            ax5.set_title('🏅 Top Performers Ranking', fontweight='bold', fontsize=12)
+            bars = ax5.barh(y_pos, hit_rates, color=self.colors[5], alpha=0.8,
+                            rasterized=True)
+            ax5.set_title('🏅 Top Performers Ranking', fontweight='bold', fontsize=11, color='#2c3e50')
             ax5.set_xlabel('Hit Rate (%)')
             ax5.set_yticks(y_pos)
             ax5.set_yticklabels(config_names)
             
-            for bar, rate in zip(bars, hit_rates):
-                ax5.text(bar.get_width() + 0.5, bar.get_y() + bar.get_height()/2,
-                        f'{rate:.1f}%', va='center', fontweight='bold')
-        
-        # Style all axes
-        for ax in [ax1, ax2, ax3, ax4, ax5]:
-            self._create_modern_axis(ax, ax.get_title())
-            ax.set_title(ax.get_title(), fontsize=11)  # Reduce title size for subplots
-        
-        plt.tight_layout()
-        plt.subplots_adjust(top=0.90)
-        plt.show()
+            ax5.bar_label(bars, labels=[f'{rate:.1f}%' for rate in hit_rates],
+                          padding=3, fontweight='bold')
+        
+        self._show(fig)
     
     def plot_performance_trend(self, experiment_results):
         """Show performance trends across experiments"""
         print("   📊 Generating Performance Trends - Watch the story unfold!")
         
         experiment_names = list(experiment_results.keys())
-        hit_rates = [experiment_results[exp]['hit_rate'] for exp in experiment_names]
+        hit_rates = np.fromiter(map(itemgetter('hit_rate'), experiment_results.values()),
+                                dtype=float, count=len(experiment_results))
+        
+        # Extremes found once, not re-scanned inside the annotation loop
+        best, worst = int(hit_rates.argmax()), int(hit_rates.argmin())
+        best_rate, worst_rate = hit_rates[best], hit_rates[worst]
         
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig, (ax,) = self._get_figure('performance_trend', (14, 8))
         ax = self._create_modern_axis(ax, '🚀 Performance Journey Across Experiments')
         
         # Create an engaging line plot
@@ -376,7 +688,8 @@ class Visualizer:
                       alpha=0.8)[0]
         
         # Add gradient fill under the line
-        ax.fill_between(x_pos, hit_rates, alpha=0.2, color=self.colors[0])
+        ax.fill_between(x_pos, hit_rates, alpha=0.2, color=self.colors[0],
+                        rasterized=True)
         
         # Annotate each point with insights
         for i, (name, rate) in enumerate(zip(experiment_names, hit_rates)):
@@ -391,7 +704,7 @@ class Visualizer:
                        bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.9))
             
             # Experiment label
-            ax.annotate(clean_name, (i, min(hit_rates) * 0.95),
+            ax.annotate(clean_name, (i, worst_rate * 0.95),
                        xytext=(0, -30), textcoords='offset points',
                        ha='center', fontweight='bold', fontsize=9, rotation=45,
                        bbox=dict(boxstyle="round,pad=0.3", facecolor='lightgray', alpha=0.7))
@@ -399,85 +712,68 @@ class Visualizer:
         ax.set_xticks(x_pos)
         ax.set_xticklabels([f'🎯' for _ in experiment_names])  # Simple markers
         ax.set_ylabel('Hit Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_ylim(min(hit_rates) * 0.9, max(hit_rates) * 1.1)
+        ax.set_ylim(worst_rate * 0.9, best_rate * 1.1)
         
         # Add overall insights
-        best_exp = experiment_names[np.argmax(hit_rates)]
-        best_rate = max(hit_rates)
-        worst_exp = experiment_names[np.argmin(hit_rates)]
-        worst_rate = min(hit_rates)
+        best_exp = experiment_names[best]
+        worst_exp = experiment_names[worst]
         
         insights_text = f"""🏆 Best: {best_exp.replace('_', ' ')} ({best_rate:.1f}%)
 📉 Worst: {worst_exp.replace('_', ' ')} ({worst_rate:.1f}%)
-📈 Range: {max(hit_rates)-min(hit_rates):.1f}%"""
+📈 Range: {best_rate - worst_rate:.1f}%"""
         
         ax.text(0.02, 0.98, insights_text, transform=ax.transAxes,
                fontsize=11, fontweight='bold', va='top',
                bbox=dict(boxstyle="round,pad=0.8", facecolor='lightblue', alpha=0.9))
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
     
     def compare_multiple_configs(self, config_results, title="🔍 Configuration Face-Off"):
         """Compare multiple configurations in an engaging way"""
         print("   ⚔️  Generating Configuration Face-Off - Let the battle begin!")
         
         config_names = list(config_results.keys())
-        hit_rates = [config_results[config]['hit_rate'] for config in config_names]
+        hit_rates = np.fromiter(map(itemgetter('hit_rate'), config_results.values()),
+                                dtype=float, count=len(config_results))
         
-        fig, ax = plt.subplots(figsize=(14, 8))
+        fig, (ax,) = self._get_figure('multiple_configs', (14, 8))
         ax = self._create_modern_axis(ax, title)
         
         # Create bars with different colors based on performance
         sorted_indices = np.argsort(hit_rates)[::-1]  # Sort descending
         sorted_names = [config_names[i] for i in sorted_indices]
-        sorted_rates = [hit_rates[i] for i in sorted_indices]
+        sorted_rates = hit_rates[sorted_indices]  # sorted_rates[0] is the max
         
         bars = ax.bar(range(len(sorted_names)), sorted_rates, 
-                     color=[self.colors[i % len(self.colors)] for i in range(len(sorted_names))],
-                     alpha=0.8, edgecolor='white', linewidth=2)
-        
-        # Add performance indicators and values
-        for i, (bar, rate, name) in enumerate(zip(bars, sorted_rates, sorted_names)):
-            # Clean name for display
-            clean_name = name.replace('Pattern_', '').replace('_', ' ')
-            
-            # Performance indicator
-            if i == 0:
-                indicator = "🥇 GOLD"
-                color = 'gold'
-            elif i == 1:
-                indicator = "🥈 SILVER" 
-                color = 'silver'
-            elif i == 2:
-                indicator = "🥉 BRONZE"
-                color = '#cd7f32'
-            else:
-                indicator = f"#{i+1}"
-                color = 'lightgray'
-            
-            # Value above bar
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() + 0.5,
-                   f'{rate:.1f}%', ha='center', va='bottom', fontweight='bold',
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor='white', alpha=0.9))
-            
-            # Configuration name below
-            ax.text(bar.get_x() + bar.get_width()/2, -max(hit_rates)*0.05,
-                   clean_name, ha='center', va='top', fontweight='bold', fontsize=10,
-                   rotation=45,
-                   bbox=dict(boxstyle="round,pad=0.3", facecolor=color, alpha=0.7))
-            
-            # Rank indicator
-            ax.text(bar.get_x() + bar.get_width()/2, bar.get_height() * 0.5,
-                   indicator, ha='center', va='center', fontweight='bold', 
-                   fontsize=9, color='white' if i < 3 else 'black')
+                     color=self._cycle_colors(len(sorted_names)),
+                     alpha=0.8, edgecolor='white', linewidth=2,
+                     rasterized=True)
+        
+        # Value above each bar
+        ax.bar_label(bars, labels=[f'{rate:.1f}%' for rate in sorted_rates],
+                     padding=3, fontweight='bold')
+        
+        # Performance indicator in the middle of the bar
+        medals = ["🥇 GOLD", "🥈 SILVER", "🥉 BRONZE"]
+        indicators = [medals[i] if i < 3 else f"#{i+1}" for i in range(len(bars))]
+        rank_texts = ax.bar_label(bars, labels=indicators, label_type='center',
+                                  fontweight='bold', fontsize=9, color='white')
+        for text in rank_texts[3:]:
+            text.set_color('black')
+        
+        # Configuration name below
+        clean_names = [name.replace('Pattern_', '').replace('_', ' ')
+                       for name in sorted_names]
+        self._plain_labels(ax, range(len(bars)),
+                           [-sorted_rates[0] * 0.05] * len(bars), clean_names,
+                           ha='center', va='top', fontweight='bold', fontsize=10,
+                           rotation=45)
         
         ax.set_xticks([])
         ax.set_ylabel('Hit Rate (%)', fontsize=12, fontweight='bold')
-        ax.set_ylim(0, max(hit_rates) * 1.15)
+        ax.set_ylim(0, sorted_rates[0] * 1.15)
         
-        plt.tight_layout()
-        plt.show()
+        self._show(fig)
     
     def _create_gradient(self, base_color, start_alpha, end_alpha):
         """Create a gradient effect for bars"""
@@ -6,72 +6,315 @@
 
 import sys
 import os
+import random
+import pytest
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
 from cache_config import CacheConfig
 from cache import Cache
 
+COUNTERS = ('accesses', 'hits', 'misses', 'replacements')
+
+def random_trace(seed, count=3000, max_address=20000):
+    """The same random addresses every time for a given seed"""
+    rng = random.Random(seed)
+    return [rng.randint(0, max_address) for _ in range(count)]
+
+def assert_same_counts(actual, expected, keys=COUNTERS):
+    """Compare stats field by field, so a failure names the counter"""
+    for key in keys:
+        assert actual[key] == expected[key], key
+
 def test_basic():
     """Test that the cache actually works"""
     print("🧪 Testing basic cache...")
     
-    try:
-        config = CacheConfig(cache_size_kb=4, block_size_bytes=64, associativity=1)
-        cache = Cache(config, policy_name="LRU")
-        
-        # Basic accesses
-        result1 = cache.access(0)  # FIXED: access_address -> access
-        result2 = cache.access(64)  # FIXED: access_address -> access
-        result3 = cache.access(0)  # FIXED: access_address -> access (Should be a hit!)
-        
-        print(f"  First access (0): {result1}")
-        print(f"  Second access (64): {result2}")
-        print(f"  Third access (0): {result3}")
-        
-        stats = cache.get_stats()
-        print(f"  Total: {stats['accesses']}, Hits: {stats['hits']}")
-        print(f"  Hit rate: {stats['hit_rate']:.1f}%")
-        
-        print("✅ Basic test passed!")
-        return True
-        
-    except Exception as e:
-        print(f"❌ Test failed: {e}")
-        return False
-
-def test_policies():
-    """Test all replacement policies"""
-    print("\n🧪 Testing policies...")
-    
-    policies = ["LRU", "FIFO", "RANDOM"]
-    addresses = [0, 64, 128, 0, 64, 256]
-    
-    for policy in policies:
-        try:
-            config = CacheConfig(cache_size_kb=2, block_size_bytes=64, associativity=2)
-            cache = Cache(config, policy_name=policy)
-            
-            for addr in addresses:
-                cache.access(addr)  # FIXED: access_address -> access
-            
-            stats = cache.get_stats()
-            print(f"  {policy}: {stats['hit_rate']:.1f}%")
-            
-        except Exception as e:
-            print(f"❌ {policy} failed: {e}")
-            return False
-    
-    print("✅ All policies work!")
-    return True
+    config = CacheConfig(cache_size_kb=4, block_size_bytes=64, associativity=1)
+    cache = Cache(config, policy_name="LRU")
+    
+    # Basic accesses
+    result1 = cache.access(0)
+    result2 = cache.access(64)
+    result3 = cache.access(0)  # Should be a hit!
+    
+    print(f"  First access (0): {result1}")
+    print(f"  Second access (64): {result2}")
+    print(f"  Third access (0): {result3}")
+    
+    assert (result1, result2, result3) == ("MISS", "MISS", "HIT")
+    stats = cache.get_stats()
+    assert stats['accesses'] == 3 and stats['hits'] == 1
+    print(f"  Hit rate: {stats['hit_rate']:.1f}%")
+    print("✅ Basic test passed!")
 
-if __name__ == "__main__":
-    print("🚀 Running Cache Tests")
-    print("=" * 40)
+@pytest.mark.parametrize("policy", ["LRU", "FIFO", "RANDOM"])
+def test_policies(policy):
+    """Every replacement policy runs and counts every access"""
+    print(f"\n🧪 Testing {policy}...")
+    
+    config = CacheConfig(cache_size_kb=2, block_size_bytes=64, associativity=2)
+    cache = Cache(config, policy_name=policy)
+    
+    for addr in [0, 64, 128, 0, 64, 256]:
+        cache.access(addr)
+    
+    stats = cache.get_stats()
+    assert stats['accesses'] == 6
+    assert stats['hits'] + stats['misses'] == 6
+    print(f"  {policy}: {stats['hit_rate']:.1f}%")
+
+def test_lru_vs_fifo_eviction():
+    """LRU keeps a re-used block, FIFO evicts it anyway"""
+    print("\n🧪 Testing eviction order...")
+    
+    # 1 set, 2 ways: A, B, A (hit), C -> LRU evicts B, FIFO evicts A
+    config = CacheConfig(cache_size_kb=1, block_size_bytes=512, associativity=2)
+    addresses = [0, 512, 0, 1024, 0]
+    
+    lru = Cache(config, policy_name="LRU")
+    fifo = Cache(config, policy_name="FIFO")
+    lru_results = [lru.access(addr) for addr in addresses]
+    fifo_results = [fifo.access(addr) for addr in addresses]
+    
+    assert lru_results == ["MISS", "MISS", "HIT", "MISS", "HIT"]
+    assert fifo_results == ["MISS", "MISS", "HIT", "MISS", "MISS"]
+    print("✅ Eviction order is right!")
+
+@pytest.mark.parametrize("policy, associativity", [
+    ("LRU", 4),   # _simulate with touch_on_hit
+    ("FIFO", 4),  # _simulate without it
+    ("LRU", 1),   # simulate_direct
+    ("FIFO", 0),  # fully associative: one set, every block a way
+])
+def test_run_trace_matches_access(policy, associativity):
+    """Batch replay must give the same numbers as access() one by one"""
+    print(f"\n🧪 Testing run_trace ({policy}, {associativity}-way)...")
     
-    test1 = test_basic()
-    test2 = test_policies()
+    trace = random_trace(7)
     
-    if test1 and test2:
-        print("\n🎉 All tests passed!")
-    else:
-        print("\n💥 Some tests failed!")
\ No newline at end of file
+    config = CacheConfig(cache_size_kb=2, block_size_bytes=32,
+                         associativity=associativity)
+    one_by_one = Cache(config, policy_name=policy)
+    batched = Cache(config, policy_name=policy)
+    
+    for addr in trace:
+        one_by_one.access(addr)
+    batched.run_trace(trace[:1000])
+    for addr in trace[1000:1500]:
+        batched.access(addr)
+    batched.run_trace(trace[1500:])
+    
+    assert_same_counts(batched.get_stats(), one_by_one.get_stats())
+    print("✅ run_trace agrees with access()!")
+
+def test_random_policy_is_repeatable():
+    """Same trace, same seed -> same RANDOM stats, run after run"""
+    print("\n🧪 Testing RANDOM repeatability...")
+    
+    trace = random_trace(5, count=5000, max_address=50000)
+    config = CacheConfig(cache_size_kb=4, block_size_bytes=64, associativity=4)
+    
+    runs = [Cache(config, policy_name="RANDOM").run_trace(trace) for _ in range(3)]
+    assert runs[0]['replacements'] > 0  # victims were actually chosen
+    assert runs[0] == runs[1] == runs[2]
+    
+    stepped = []
+    for _ in range(2):
+        cache = Cache(config, policy_name="RANDOM")
+        for addr in trace:
+            cache.access(addr)
+        stepped.append(cache.get_stats())
+    assert stepped[0] == stepped[1]
+    print("✅ RANDOM is repeatable!")
+
+@pytest.mark.parametrize("policy,name", [("LRU", "LRU"), ("FIFO", "FIFO"),
+                                         ("RANDOM", "Random")])
+def test_direct_mapped_keeps_policy_name(policy, name):
+    """A 1-way cache replays as direct-mapped but reports the policy asked for"""
+    config = CacheConfig(cache_size_kb=4, block_size_bytes=64, associativity=1)
+    trace = [i * 64 for i in range(200)] * 2
+    
+    cache = Cache(config, policy_name=policy)
+    stats = cache.run_trace(trace)
+    assert stats['policy'] == name
+    
+    # Same replay as any other 1-way cache, and the stats land on cache.policy
+    assert stats['hits'] == Cache(config, policy_name="LRU").run_trace(trace)['hits']
+    assert cache.policy.stats['hits'] == stats['hits']
+
+def test_run_sweep_matches_run_trace():
+    """run_sweep hands back what run_trace gives each cache, in order"""
+    print("\n🧪 Testing run_sweep...")
+    
+    from cache import run_sweep
+    trace = random_trace(11)
+    
+    # Kernel caches (threaded when the kernel drops the GIL) mixed with
+    # RANDOM ones (Python replay, run serially)
+    setups = [("LRU", 4), ("RANDOM", 4), ("FIFO", 2), ("LRU", 1), ("RANDOM", 0)]
+    def build():
+        return [Cache(CacheConfig(cache_size_kb=2, block_size_bytes=32,
+                                  associativity=ways), policy_name=policy)
+                for policy, ways in setups]
+    
+    expected = [cache.run_trace(trace) for cache in build()]
+    swept = run_sweep(build(), trace, max_workers=2)
+    
+    assert len(swept) == len(setups)
+    for actual, wanted in zip(swept, expected):
+        assert actual['time'] >= 0 and actual['cpu_time'] >= 0
+        assert_same_counts(actual, wanted, COUNTERS + ('policy',))
+    print("✅ run_sweep agrees with run_trace!")
+
+@pytest.mark.parametrize("policy, associativity", [
+    ("LRU", 4),
+    ("FIFO", 4),
+    ("RANDOM", 4),  # no Cython loop: inherited Python replay
+    ("LRU", 1),     # direct-mapped: simulate_lru here, simulate_direct in cache.py
+    ("FIFO", 1),
+    ("LRU", 0),     # fully associative: one set, every block a way
+    ("FIFO", 0),
+])
+def test_cython_cache_matches_python(policy, associativity):
+    """The optional Cython Cache must count exactly like the Python one"""
+    cache_ext = pytest.importorskip("cache_ext")
+    print(f"\n🧪 Testing cache_ext ({policy}, {associativity}-way)...")
+    
+    trace = random_trace(11)
+    config = CacheConfig(cache_size_kb=2, block_size_bytes=32,
+                         associativity=associativity)
+    expected = Cache(config, policy_name=policy).run_trace(trace)
+    actual = cache_ext.Cache(config, policy_name=policy).run_trace(trace)
+    
+    assert_same_counts(actual, expected)
+    print("✅ Cython and Python agree!")
+
+def test_trace_generator_memoizes():
+    """Same parameters -> the same read-only array; new parameters -> a new one"""
+    from trace_generator import TraceGenerator
+    
+    gen = TraceGenerator()
+    for make, other in [(lambda: gen.sequential(count=500), lambda: gen.sequential(count=501)),
+                        (lambda: gen.random(count=500), lambda: gen.random(max_address=999, count=500)),
+                        (lambda: gen.looping(loop_size=50), lambda: gen.looping(loop_size=50, stride=8)),
+                        (lambda: gen.mixed(500), lambda: gen.mixed(600))]:
+        first = make()
+        assert make() is first
+        assert not first.flags.writeable
+        with pytest.raises(ValueError):
+            first[0] = 1
+        assert other() is not first
+    
+    # The cache is per generator
+    assert TraceGenerator().sequential(count=500) is not gen.sequential(count=500)
+
+def test_lttb_keeps_outliers():
+    """Downsampling for the access plot must not drop a lone spike"""
+    print("\n🧪 Testing LTTB downsampling...")
+    
+    import numpy as np
+    from visualizer import _lttb
+    
+    ys = np.zeros(5000)
+    ys[1234] = 1e6
+    picked = _lttb(np.arange(5000), ys, 200)
+    
+    assert len(picked) == 200
+    assert 1234 in picked
+    assert picked[0] == 0 and picked[-1] == 4999
+    print("✅ The spike survived!")
+
+def test_top_k_breaks_ties_by_position():
+    """Tied hit rates rank in insertion order, like the old sorted()[:8]"""
+    from visualizer import _top_k
+    
+    # The shape of main.py's results: lots of exact ties around the cut
+    rates = [88.0, 91.925, 91.925, 91.925, 99.6, 99.6, 99.6, 99.6,
+             99.3, 93.7, 69.6, 91.925]
+    for k in (1, 4, 7, 8, 12, 20):
+        expected = sorted(range(len(rates)), key=lambda i: -rates[i])[:k]
+        assert _top_k(rates, k).tolist() == expected
+    assert _top_k([], 8).tolist() == []
+
+def test_bound_access_survives_full_log():
+    """access = cache.access keeps working after the log fills up"""
+    config = CacheConfig(cache_size_kb=4, block_size_bytes=64, associativity=4)
+    cache = Cache(config, policy_name="LRU")
+    access = cache.access  # the logging variant, bound once
+    results = [access(addr) for addr in random_trace(3, count=1500)]
+    
+    assert len(cache.access_log) == 1000
+    assert cache.get_stats()['accesses'] == 1500
+    assert results.count("HIT") == cache.get_stats()['hits']
+
+def test_log_from_dicts_matches_cache_log():
+    """Old list-of-dicts logs convert to the same records the cache keeps"""
+    print("\n🧪 Testing access-log conversion...")
+    
+    from visualizer import _as_log_array
+    
+    config = CacheConfig(cache_size_kb=1, block_size_bytes=64, associativity=2)
+    cache = Cache(config, policy_name="LRU")
+    cache.run_trace([0, 64, 0, 4096, 128, 64])
+    log = cache.access_log
+    
+    as_dicts = [{'address': int(e['address']), 'set': int(e['set']),
+                 'result': "HIT" if e['result'] else "MISS"} for e in log]
+    converted = _as_log_array(iter(as_dicts), chunk=4)
+    
+    assert converted.dtype == log.dtype
+    assert (converted == log).all()
+    print("✅ Same records either way!")
+
+def test_access_pattern_rejects_unknown_backend():
+    """A typo in backend= should fail loudly, not quietly fall back"""
+    from visualizer import Visualizer
+    
+    with pytest.raises(ValueError):
+        Visualizer().plot_access_pattern([], backend='datashaderr')
+
+def test_access_pattern_datashader_draws_image():
+    """Past raster_threshold the datashader backend blits one image"""
+    pytest.importorskip("datashader")
+    from visualizer import Visualizer
+    
+    config = CacheConfig(cache_size_kb=1, block_size_bytes=64, associativity=2)
+    cache = Cache(config, policy_name="LRU")
+    cache.run_trace([i * 64 for i in range(500)] * 2)
+    
+    viz = Visualizer()
+    viz.plot_access_pattern(cache.access_log, backend='datashader',
+                            raster_threshold=100)
+    (_, (timeline, _)), = viz._fig_cache.values()
+    assert len(timeline.images) == 1
+    assert not timeline.collections  # no scatter fallback
+    viz.close()
+
+def test_dashboard_template_matches_cold_build(tmp_path):
+    """A dashboard unpickled from the template looks like one built from scratch"""
+    from visualizer import Visualizer
+    
+    cold_viz = Visualizer(template_dir=tmp_path)
+    cold_fig, cold_axes = cold_viz._dashboard_figure()
+    assert os.path.exists(cold_viz._dashboard_template_path)
+    
+    warm_viz = Visualizer(template_dir=tmp_path)
+    warm_viz._dashboard_axes = None  # would fail if it laid the grid out again
+    warm_fig, warm_axes = warm_viz._dashboard_figure()
+    assert warm_fig is not cold_fig
+    
+    cold_fig.canvas.draw()
+    warm_fig.canvas.draw()
+    assert len(warm_fig.axes) == len(cold_fig.axes) == len(cold_axes) == len(warm_axes)
+    for cold, warm in zip(cold_axes, warm_axes):
+        assert warm.get_position().bounds == pytest.approx(cold.get_position().bounds)
+        assert warm.get_facecolor() == cold.get_facecolor()
+        assert ([s.get_visible() for s in warm.spines.values()]
+                == [s.get_visible() for s in cold.spines.values()])
+        assert ([line.get_visible() for line in warm.get_xgridlines()]
+                == [line.get_visible() for line in cold.get_xgridlines()])
+    cold_viz.close()
+    warm_viz.close()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-v"]))